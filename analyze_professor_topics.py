@@ -5,120 +5,303 @@
 输出：教授的研究主题分析结果，包含实体和关系的taxonomy
 """
 
+import argparse
+import functools
 import json
+import logging
+import mmap
+import multiprocessing
 import sys
 import os
 from collections import defaultdict, Counter
+from itertools import groupby
+from logging.handlers import QueueHandler, QueueListener
+from operator import attrgetter
 from pathlib import Path
+from typing import List, NamedTuple, Optional
+
+logger = logging.getLogger(__name__)
+
+# orjson 为可选依赖，不可用时退回标准库 json
+try:
+    import orjson
+    ORJSON_AVAILABLE = True
+except ImportError:
+    ORJSON_AVAILABLE = False
+
+# msgspec 为可选依赖，可用时把层次关系直接解码为定长结构体
+try:
+    import msgspec
+    MSGSPEC_AVAILABLE = True
+except ImportError:
+    MSGSPEC_AVAILABLE = False
+
+# zstandard 为可选依赖，用于 --compress 压缩输出
+try:
+    import zstandard
+    ZSTD_AVAILABLE = True
+except ImportError:
+    ZSTD_AVAILABLE = False
+
+# ijson 为可选依赖，可用时逐篇流式读取文章，避免整个文件常驻内存
+try:
+    import ijson
+    IJSON_AVAILABLE = True
+except ImportError:
+    IJSON_AVAILABLE = False
+
+def load_json_file(path):
+    """读取 JSON 文件，优先使用 orjson"""
+    if ORJSON_AVAILABLE:
+        return orjson.loads(Path(path).read_bytes())
+    with open(path, 'r', encoding='utf-8') as f:
+        return json.load(f)
+
+def encode_json(obj):
+    """把对象编码为缩进格式的 UTF-8 JSON 字节串（保留非 ASCII 字符），优先使用 orjson"""
+    if ORJSON_AVAILABLE:
+        return orjson.dumps(obj, option=orjson.OPT_INDENT_2 | orjson.OPT_NON_STR_KEYS)
+    return json.dumps(obj, indent=2, ensure_ascii=False).encode('utf-8')
+
+def dump_json_file(obj, path):
+    """以缩进格式写出 JSON 文件，一次性写入"""
+    Path(path).write_bytes(encode_json(obj))
+
+def _stream_papers(professor_file):
+    """用 ijson 逐篇产出教授文件中的文章"""
+    with open(professor_file, 'rb') as f:
+        yield from ijson.items(f, 'papers.item', use_float=True)
+
+def load_professor_file(professor_file):
+    """读取教授文件，返回 (professor_info, 文章迭代器)"""
+    if not IJSON_AVAILABLE:
+        data = load_json_file(professor_file)
+        return data.get('professor_info', {}), iter(data.get('papers', []))
+    
+    with open(professor_file, 'rb') as f:
+        prof_info = next(ijson.items(f, 'professor_info', use_float=True), {})
+    return prof_info, _stream_papers(professor_file)
+
+class PaperRec(NamedTuple):
+    """单篇文章规范化后的扁平记录，只保留主题分析需要的字段"""
+    paper_id: Optional[str]
+    title: Optional[str]
+    publication_date: Optional[str]
+    doi: Optional[str]
+    cited_by_count: int
+    score: float
+    primary_topic: dict
+    topic_id: Optional[str]
+    topic_name: Optional[str]
+    subfield_id: Optional[str]
+    subfield_name: Optional[str]
+    field_id: Optional[str]
+    field_name: Optional[str]
+    domain_id: Optional[str]
+    domain_name: Optional[str]
+
+def _intern_id(value):
+    """驻留字符串 ID：同一 ID 在文章和教授之间共享一个对象，哈希只计算一次"""
+    return sys.intern(value) if isinstance(value, str) else value
+
+def _level_id_name(primary_topic, key):
+    """取出 primary_topic 中某一层级的 (id, display_name)"""
+    level = primary_topic.get(key)
+    if level and isinstance(level, dict):
+        return _intern_id(level.get('id')), level.get('display_name')
+    return None, None
+
+def normalize_paper(paper):
+    """把文章字典规范化为 PaperRec；没有有效 primary_topic 的文章返回 None"""
+    # 确保 paper 本身不是 None 并且是字典
+    if paper is None or not isinstance(paper, dict):
+        return None
+    
+    primary_topic = paper.get('primary_topic')
+    # 检查 primary_topic 是否为 None 或空字典
+    if primary_topic is None or not isinstance(primary_topic, dict) or not primary_topic:
+        return None
+    
+    subfield_id, subfield_name = _level_id_name(primary_topic, 'subfield')
+    field_id, field_name = _level_id_name(primary_topic, 'field')
+    domain_id, domain_name = _level_id_name(primary_topic, 'domain')
+    
+    return PaperRec(
+        paper_id=paper.get('id'),
+        title=paper.get('title'),
+        publication_date=paper.get('publication_date'),
+        doi=paper.get('doi'),
+        cited_by_count=paper.get('cited_by_count', 0),
+        score=primary_topic.get('score', 0),
+        primary_topic=primary_topic,
+        topic_id=_intern_id(primary_topic.get('id')),
+        topic_name=primary_topic.get('display_name'),
+        subfield_id=subfield_id,
+        subfield_name=subfield_name,
+        field_id=field_id,
+        field_name=field_name,
+        domain_id=domain_id,
+        domain_name=domain_name
+    )
+
+if MSGSPEC_AVAILABLE:
+    class Rel(msgspec.Struct, frozen=True):
+        """一条层次关系"""
+        parent_id: Optional[str] = None
+        child_id: Optional[str] = None
+        parent_name: Optional[str] = None
+        child_name: Optional[str] = None
+        relationship_type: Optional[str] = 'hierarchical'
+else:
+    class Rel(NamedTuple):
+        """一条层次关系"""
+        parent_id: Optional[str] = None
+        child_id: Optional[str] = None
+        parent_name: Optional[str] = None
+        child_name: Optional[str] = None
+        relationship_type: Optional[str] = 'hierarchical'
 
 def load_cs_relationships(relationships_file):
-    """加载计算机科学领域的层次关系"""
+    """加载计算机科学领域的层次关系，返回 Rel 列表"""
     try:
-        with open(relationships_file, 'r', encoding='utf-8') as f:
-            relationships = json.load(f)
-        return relationships
+        if MSGSPEC_AVAILABLE:
+            # 内存映射文件，直接交给 msgspec 解码，不为每条关系创建字典
+            with open(relationships_file, 'rb') as f:
+                with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as buf:
+                    return msgspec.json.decode(buf, type=List[Rel])
+        
+        relationships = load_json_file(relationships_file)
+        return [Rel(parent_id=_intern_id(rel.get('parent_id')),
+                    child_id=_intern_id(rel.get('child_id')),
+                    parent_name=rel.get('parent_name'),
+                    child_name=rel.get('child_name'),
+                    relationship_type=rel.get('relationship_type', 'hierarchical'))
+                for rel in relationships]
     except Exception as e:
-        print(f"Error loading relationships file: {e}")
+        logger.error("Error loading relationships file: %s", e)
         return []
 
-def analyze_professor_topics(professor_file, relationships_file=None):
-    """分析教授的研究主题"""
+class RelationshipIndex(NamedTuple):
+    """层次关系及其按父/子节点建立的索引，索引值为 (原始位置, 关系) 列表"""
+    relationships: list
+    by_parent: dict
+    by_child: dict
+
+def index_relationships(relationships):
+    """按 parent_id / child_id 为层次关系建立索引"""
+    by_parent = defaultdict(list)
+    by_child = defaultdict(list)
+    for index, rel in enumerate(relationships):
+        by_parent[_intern_id(rel.parent_id)].append((index, rel))
+        by_child[_intern_id(rel.child_id)].append((index, rel))
+    return RelationshipIndex(relationships, dict(by_parent), dict(by_child))
+
+@functools.lru_cache(maxsize=1)
+def _load_relationships(relationships_file):
+    """解析层次关系文件并建立索引，结果缓存，同一文件只读取一次；文件不存在时返回 None"""
+    if not relationships_file or not os.path.exists(relationships_file):
+        return None
+    return index_relationships(load_cs_relationships(relationships_file))
+
+def analyze_professor_topics(professor_file, relationships=None):
+    """分析教授的研究主题；relationships 为已建立索引的层次关系（见 _load_relationships）"""
     
-    # 加载教授数据
+    # 加载教授数据：基本信息 + 逐篇规范化的文章记录
+    # 每篇文章只规范化一次，之后的统计全部基于扁平记录
     try:
-        with open(professor_file, 'r', encoding='utf-8') as f:
-            data = json.load(f)
+        prof_info, papers = load_professor_file(professor_file)
+        total_papers_analyzed = 0
+        records = []
+        for paper in papers:
+            total_papers_analyzed += 1
+            rec = normalize_paper(paper)
+            if rec is not None:
+                records.append(rec)
     except Exception as e:
-        print(f"Error loading professor file: {e}")
+        logger.error("Error loading professor file: %s", e)
         return None
     
-    # 获取教授基本信息
-    prof_info = data.get('professor_info', {})
-    papers = data.get('papers', [])
-    
     # 统计primary_topic和相关文章
-    topic_papers = defaultdict(list)
-    topic_stats = defaultdict(int)
-    
-    # 收集所有相关的实体信息
-    fields = set()
-    subfields = set()
-    topics = set()
-    domains = set()
-    
-    for paper in papers:
-        # 确保 paper 本身不是 None 并且是字典
-        if paper is None or not isinstance(paper, dict):
-            continue
-            
-        primary_topic = paper.get('primary_topic')
-        # 检查 primary_topic 是否为 None 或空字典
-        if primary_topic is None or not isinstance(primary_topic, dict) or not primary_topic:
-            continue
-            
-        topic_id = primary_topic.get('id')
-        topic_name = primary_topic.get('display_name')
+    topic_papers = {}
+    topic_stats = {}
+    topic_details = {}
+    # 各层级到其下主题的反向映射，层级文章数由 topic_stats 汇总得到
+    subfield_to_topics = defaultdict(set)
+    field_to_topics = defaultdict(set)
+    domain_to_topics = defaultdict(set)
+    # 各层级的文章倒排索引，实体的 papers 列表直接取用
+    papers_by_subfield = defaultdict(list)
+    papers_by_field = defaultdict(list)
+    papers_by_domain = defaultdict(list)
+    
+    # 收集所有相关的实体信息：id -> 名称
+    field_name_by_id = {}
+    subfield_name_by_id = {}
+    topic_name_by_id = {}
+    domain_name_by_id = {}
+    
+    # 按主题排序后分组，每个主题的文章列表一次性生成（稳定排序保留文章原有顺序）
+    topic_records = [rec for rec in records if rec.topic_id and rec.topic_name]
+    topic_records.sort(key=attrgetter('topic_id'))
+    
+    for topic_id, group in groupby(topic_records, key=attrgetter('topic_id')):
+        group = list(group)
         
-        if topic_id and topic_name:
-            # 添加文章到对应主题
-            paper_info = {
-                'id': paper.get('id'),
-                'title': paper.get('title'),
-                'publication_date': paper.get('publication_date'),
-                'doi': paper.get('doi'),
-                'cited_by_count': paper.get('cited_by_count', 0),
-                'primary_topic_score': primary_topic.get('score', 0)
-            }
-            
-            topic_papers[topic_id].append(paper_info)
-            topic_stats[topic_id] += 1
+        # 添加文章到对应主题
+        topic_papers[topic_id] = [{
+            'id': rec.paper_id,
+            'title': rec.title,
+            'publication_date': rec.publication_date,
+            'doi': rec.doi,
+            'cited_by_count': rec.cited_by_count,
+            'primary_topic_score': rec.score
+        } for rec in group]
+        topic_stats[topic_id] = len(group)
+        # 记录第一次出现的主题详细信息，避免之后再次遍历所有文章
+        topic_details[topic_id] = group[0].primary_topic
+        
+        for rec in group:
+            # 每个主题唯一对应一个子领域/领域/大类
+            if rec.subfield_id:
+                subfield_to_topics[rec.subfield_id].add(topic_id)
+                papers_by_subfield[rec.subfield_id].append(rec.paper_id)
+            if rec.field_id:
+                field_to_topics[rec.field_id].add(topic_id)
+                papers_by_field[rec.field_id].append(rec.paper_id)
+            if rec.domain_id:
+                domain_to_topics[rec.domain_id].add(topic_id)
+                papers_by_domain[rec.domain_id].append(rec.paper_id)
             
             # 收集层次信息
-            topics.add((topic_id, topic_name))
+            topic_name_by_id.setdefault(topic_id, rec.topic_name)
             
-            subfield = primary_topic.get('subfield')
-            if subfield and isinstance(subfield, dict):
-                subfield_id = subfield.get('id')
-                subfield_name = subfield.get('display_name')
-                if subfield_id and subfield_name:
-                    subfields.add((subfield_id, subfield_name))
+            if rec.subfield_id and rec.subfield_name:
+                subfield_name_by_id.setdefault(rec.subfield_id, rec.subfield_name)
             
-            field = primary_topic.get('field')
-            if field and isinstance(field, dict):
-                field_id = field.get('id')
-                field_name = field.get('display_name')
-                if field_id and field_name:
-                    fields.add((field_id, field_name))
+            if rec.field_id and rec.field_name:
+                field_name_by_id.setdefault(rec.field_id, rec.field_name)
             
-            domain = primary_topic.get('domain')
-            if domain and isinstance(domain, dict):
-                domain_id = domain.get('id')
-                domain_name = domain.get('display_name')
-                if domain_id and domain_name:
-                    domains.add((domain_id, domain_name))
+            if rec.domain_id and rec.domain_name:
+                domain_name_by_id.setdefault(rec.domain_id, rec.domain_name)
+    
+    # 复用主题统计得到各层级的文章数，无需再次遍历文章
+    subfield_counts = {sf: sum(topic_stats[t] for t in ts) for sf, ts in subfield_to_topics.items()}
+    field_counts = {f: sum(topic_stats[t] for t in ts) for f, ts in field_to_topics.items()}
+    domain_counts = {d: sum(topic_stats[t] for t in ts) for d, ts in domain_to_topics.items()}
     
     # 生成输出结果
     result = {
         'professor_info': prof_info,
         'topic_analysis': {
             'total_topics': len(topic_papers),
-            'total_papers_analyzed': len(papers),
+            'total_papers_analyzed': total_papers_analyzed,
             'topics_with_papers': {}
         }
     }
     
     # 为每个主题添加详细信息
     for topic_id, paper_list in topic_papers.items():
-        # 查找包含该主题的文章获取主题详细信息
-        topic_detail = None
-        
-        for paper in papers:
-            if (paper and isinstance(paper, dict) and 
-                paper.get('primary_topic') and 
-                isinstance(paper.get('primary_topic'), dict) and
-                paper.get('primary_topic', {}).get('id') == topic_id):
-                topic_detail = paper['primary_topic']
-                break
+        topic_detail = topic_details[topic_id]
         
         if topic_detail:
             result['topic_analysis']['topics_with_papers'][topic_id] = {
@@ -134,8 +317,8 @@ def analyze_professor_topics(professor_file, relationships_file=None):
                 'avg_citations': sum(p.get('cited_by_count', 0) for p in paper_list) / len(paper_list) if paper_list else 0
             }
     
-    # 生成实体和关系的taxonomy
-    entities = []
+    # 生成实体和关系的taxonomy，实体按 id 去重存放
+    entities_by_id = {}
     relations = []
     
     # 添加教授实体
@@ -150,78 +333,57 @@ def analyze_professor_topics(professor_file, relationships_file=None):
             'total_topics': len(topic_papers)
         }
     }
-    entities.append(prof_entity)
+    entities_by_id[prof_entity['id']] = prof_entity
     
     # 添加领域实体
-    for domain_id, domain_name in domains:
+    for domain_id, domain_name in domain_name_by_id.items():
         if domain_id and domain_name:
-            paper_count = 0
-            for paper in papers:
-                if (paper and isinstance(paper, dict) and 
-                    paper.get('primary_topic') and 
-                    isinstance(paper.get('primary_topic'), dict) and
-                    paper.get('primary_topic', {}).get('domain') and
-                    isinstance(paper.get('primary_topic', {}).get('domain'), dict) and
-                    paper.get('primary_topic', {}).get('domain', {}).get('id') == domain_id):
-                    paper_count += 1
+            paper_count = domain_counts.get(domain_id, 0)
             
-            entities.append({
+            entities_by_id[domain_id] = {
                 'id': domain_id,
                 'type': 'domain',
                 'name': domain_name,
                 'properties': {
-                    'paper_count': paper_count
+                    'paper_count': paper_count,
+                    'papers': papers_by_domain.get(domain_id, [])
                 }
-            })
+            }
     
     # 添加字段实体
-    for field_id, field_name in fields:
+    for field_id, field_name in field_name_by_id.items():
         if field_id and field_name:
-            paper_count = 0
-            for paper in papers:
-                if (paper and isinstance(paper, dict) and 
-                    paper.get('primary_topic') and 
-                    isinstance(paper.get('primary_topic'), dict) and
-                    paper.get('primary_topic', {}).get('field') and
-                    isinstance(paper.get('primary_topic', {}).get('field'), dict) and
-                    paper.get('primary_topic', {}).get('field', {}).get('id') == field_id):
-                    paper_count += 1
+            paper_count = field_counts.get(field_id, 0)
             
-            entities.append({
+            entities_by_id[field_id] = {
                 'id': field_id,
                 'type': 'field',
                 'name': field_name,
                 'properties': {
-                    'paper_count': paper_count
+                    'paper_count': paper_count,
+                    'papers': papers_by_field.get(field_id, [])
                 }
-            })
+            }
     
     # 添加子字段实体
-    for subfield_id, subfield_name in subfields:
+    for subfield_id, subfield_name in subfield_name_by_id.items():
         if subfield_id and subfield_name:
-            paper_count = 0
-            for paper in papers:
-                if (paper and isinstance(paper, dict) and 
-                    paper.get('primary_topic') and 
-                    isinstance(paper.get('primary_topic'), dict) and
-                    paper.get('primary_topic', {}).get('subfield') and
-                    isinstance(paper.get('primary_topic', {}).get('subfield'), dict) and
-                    paper.get('primary_topic', {}).get('subfield', {}).get('id') == subfield_id):
-                    paper_count += 1
+            paper_count = subfield_counts.get(subfield_id, 0)
             
-            entities.append({
+            entities_by_id[subfield_id] = {
                 'id': subfield_id,
                 'type': 'subfield',
                 'name': subfield_name,
                 'properties': {
-                    'paper_count': paper_count
+                    'paper_count': paper_count,
+                    'papers': papers_by_subfield.get(subfield_id, [])
                 }
-            })
+            }
     
     # 添加主题实体
-    for topic_id, topic_name in topics:
+    for topic_id, topic_name in topic_name_by_id.items():
         paper_count = topic_stats.get(topic_id, 0)
-        entities.append({
+        entities_by_id[topic_id] = {
             'id': topic_id,
             'type': 'topic',
             'name': topic_name,
@@ -229,7 +391,7 @@ def analyze_professor_topics(professor_file, relationships_file=None):
                 'paper_count': paper_count,
                 'papers': [p['id'] for p in topic_papers.get(topic_id, [])]
             }
-        })
+        }
     
     # 生成关系
     # 教授与主题的关系
@@ -244,155 +406,217 @@ def analyze_professor_topics(professor_file, relationships_file=None):
             }
         })
     
-    # 如果有关系文件，添加层次关系
-    if relationships_file and os.path.exists(relationships_file):
-        cs_relationships = load_cs_relationships(relationships_file)
+    # 如果有层次关系，添加层次关系
+    if relationships is not None:
+        # 过滤出与教授相关的关系：只查看以相关实体为父节点的关系（哈希连接，而非全表扫描）
+        relevant_entity_ids = entities_by_id.keys()
         
-        # 过滤出与教授相关的关系
-        relevant_entity_ids = set([e['id'] for e in entities])
+        matched = []
+        for entity_id in relevant_entity_ids:
+            for index, rel in relationships.by_parent.get(entity_id, ()):
+                if rel.child_id in relevant_entity_ids:
+                    matched.append((index, rel))
+        # 按关系文件中的原始顺序输出
+        matched.sort(key=lambda item: item[0])
         
-        for rel in cs_relationships:
-            parent_id = rel.get('parent_id')
-            child_id = rel.get('child_id')
-            
-            if parent_id in relevant_entity_ids and child_id in relevant_entity_ids:
-                relations.append({
-                    'source': parent_id,
-                    'target': child_id,
-                    'type': rel.get('relationship_type', 'hierarchical'),
-                    'properties': {
-                        'parent_name': rel.get('parent_name'),
-                        'child_name': rel.get('child_name')
-                    }
-                })
+        for _, rel in matched:
+            relations.append({
+                'source': rel.parent_id,
+                'target': rel.child_id,
+                'type': rel.relationship_type,
+                'properties': {
+                    'parent_name': rel.parent_name,
+                    'child_name': rel.child_name
+                }
+            })
     
     # 添加taxonomy到结果
     result['taxonomy'] = {
-        'entities': entities,
+        'entities': list(entities_by_id.values()),
         'relations': relations
     }
     
     return result
 
-def save_results(result, output_file):
-    """保存结果到文件"""
+# 每个进程复用同一个 zstd 压缩上下文，避免每个文件重新分配压缩缓冲区
+_zstd_compressor = None
+
+def _get_zstd_compressor():
+    """返回当前进程共享的 zstd 压缩器"""
+    global _zstd_compressor
+    if _zstd_compressor is None:
+        _zstd_compressor = zstandard.ZstdCompressor(level=3)
+    return _zstd_compressor
+
+def save_results(result, output_file, compress=False):
+    """保存结果到文件；compress 为 True 时用 zstd 压缩并写入 <output_file>.zst"""
     try:
-        with open(output_file, 'w', encoding='utf-8') as f:
-            json.dump(result, f, indent=2, ensure_ascii=False)
-        print(f"Results saved to: {output_file}")
+        payload = encode_json(result)
+        if compress:
+            payload = _get_zstd_compressor().compress(payload)
+            output_file += '.zst'
+        Path(output_file).write_bytes(payload)
+        logger.debug("Results saved to: %s", output_file)
     except Exception as e:
-        print(f"Error saving results: {e}")
+        logger.error("Error saving results: %s", e)
 
-def process_folder(folder_path, relationships_file, output_folder):
-    """处理文件夹中的所有教授文件"""
-    if not os.path.exists(folder_path):
-        print(f"Error: Folder '{folder_path}' not found")
+# 子进程中共享的层次关系，由 _init_worker 在进程启动时设置一次
+_worker_relationships = None
+
+def _init_worker(relationships, log_queue=None, log_level=logging.INFO):
+    """进程池初始化：保存父进程已解析好的层次关系，并把日志转发到父进程的队列"""
+    global _worker_relationships
+    _worker_relationships = relationships
+    
+    if log_queue is not None:
+        root = logging.getLogger()
+        root.handlers[:] = [QueueHandler(log_queue)]
+        root.setLevel(log_level)
+
+def _process_one(professor_file, output_folder, compress=False):
+    """处理单个教授文件并保存结果，返回 (教授文件, 是否成功, 输出信息)"""
+    try:
+        # 分析教授主题
+        result = analyze_professor_topics(professor_file, relationships=_worker_relationships)
+        
+        if result is None:
+            return professor_file, False, f"  Error: Failed to analyze {professor_file}"
+        
+        # 生成输出文件名
+        prof_name = result['professor_info'].get('name', 'unknown')
+        prof_id = result['professor_info'].get('author_id', 'unknown')
+        safe_name = prof_name.replace(' ', '_').replace('/', '_').replace('\\', '_')
+        output_file = os.path.join(output_folder, f"topics_analysis_{safe_name}_{prof_id}.json")
+        
+        # 保存结果
+        save_results(result, output_file, compress)
+        
+        # 简要统计信息
+        return professor_file, True, (f"  ✓ Professor: {prof_name}\n"
+                      f"    Topics: {result['topic_analysis']['total_topics']}, Papers: {result['professor_info'].get('total_papers', 0)}")
+        
+    except Exception as e:
+        # 附带详细的错误信息用于调试
+        import traceback
+        return professor_file, False, f"  ✗ Error processing {professor_file}: {str(e)}\n  Debug info: {traceback.format_exc()}"
+
+def process_folder(folder_path, relationships_file, output_folder, jobs=None, compress=False):
+    """处理文件夹中的所有教授文件（jobs 个进程并行，默认使用全部 CPU）"""
+    # 获取所有教授详细文件（scandir 一次遍历即可拿到文件类型）
+    try:
+        with os.scandir(folder_path) as it:
+            professor_files = [entry.path for entry in it
+                               if entry.name.endswith('_detail.json') and entry.is_file()]
+    except FileNotFoundError:
+        logger.error("Folder '%s' not found", folder_path)
         return
     
     # 创建输出文件夹
     os.makedirs(output_folder, exist_ok=True)
     
-    # 获取所有教授详细文件
-    professor_files = []
-    for filename in os.listdir(folder_path):
-        if filename.endswith('_detail.json'):
-            professor_files.append(os.path.join(folder_path, filename))
-    
     if not professor_files:
-        print(f"No professor detail files found in {folder_path}")
+        logger.warning("No professor detail files found in %s", folder_path)
         return
     
-    print(f"Found {len(professor_files)} professor files to process")
-    print(f"Output will be saved to: {output_folder}")
+    logger.info("Found %d professor files to process", len(professor_files))
+    logger.info("Output will be saved to: %s", output_folder)
+    
+    # 层次关系只在父进程解析一次，再分发给每个子进程
+    relationships = _load_relationships(relationships_file)
     
     successful = 0
     failed = 0
     
-    for i, professor_file in enumerate(professor_files, 1):
-        try:
-            print(f"\n[{i}/{len(professor_files)}] Processing: {os.path.basename(professor_file)}")
-            
-            # 分析教授主题
-            result = analyze_professor_topics(professor_file, relationships_file)
-            
-            if result is None:
-                print(f"  Error: Failed to analyze {professor_file}")
-                failed += 1
-                continue
-            
-            # 生成输出文件名
-            prof_name = result['professor_info'].get('name', 'unknown')
-            prof_id = result['professor_info'].get('author_id', 'unknown')
-            safe_name = prof_name.replace(' ', '_').replace('/', '_').replace('\\', '_')
-            output_file = os.path.join(output_folder, f"topics_analysis_{safe_name}_{prof_id}.json")
-            
-            # 保存结果
-            save_results(result, output_file)
-            
-            # 打印简要统计信息
-            print(f"  ✓ Professor: {prof_name}")
-            print(f"    Topics: {result['topic_analysis']['total_topics']}, Papers: {result['professor_info'].get('total_papers', 0)}")
-            
-            successful += 1
-            
-        except Exception as e:
-            print(f"  ✗ Error processing {professor_file}: {str(e)}")
-            # 打印更详细的错误信息用于调试
-            import traceback
-            print(f"  Debug info: {traceback.format_exc()}")
-            failed += 1
-    
-    print(f"\n=== Processing Complete ===")
-    print(f"Successfully processed: {successful}")
-    print(f"Failed: {failed}")
-    print(f"Total: {len(professor_files)}")
+    # 子进程的日志经队列交给父进程统一输出，避免多个进程同时写 stdout
+    root = logging.getLogger()
+    log_queue = multiprocessing.Queue()
+    listener = QueueListener(log_queue, *(root.handlers or [logging.StreamHandler()]),
+                             respect_handler_level=True)
+    listener.start()
+    
+    try:
+        with multiprocessing.Pool(processes=jobs or os.cpu_count(), initializer=_init_worker,
+                                  initargs=(relationships, log_queue, root.getEffectiveLevel())) as pool:
+            worker = functools.partial(_process_one, output_folder=output_folder, compress=compress)
+            # 结果按完成顺序流式返回，不在内存中堆积
+            outcomes = pool.imap_unordered(worker, professor_files, chunksize=32)
+            for i, (professor_file, ok, message) in enumerate(outcomes, 1):
+                if ok:
+                    logger.debug("[%d/%d] Processing: %s\n%s", i, len(professor_files),
+                                 os.path.basename(professor_file), message)
+                    successful += 1
+                else:
+                    logger.error("[%d/%d] Processing: %s\n%s", i, len(professor_files),
+                                 os.path.basename(professor_file), message)
+                    failed += 1
+    finally:
+        listener.stop()
+    
+    logger.info("\n=== Processing Complete ===")
+    logger.info("Successfully processed: %d", successful)
+    logger.info("Failed: %d", failed)
+    logger.info("Total: %d", len(professor_files))
 
 def main():
-    if len(sys.argv) < 2:
-        print("Usage: python analyze_professor_topics.py <folder_path_or_file> [relationships_file] [output_folder]")
-        print("Example: python analyze_professor_topics.py /mnt/ssd/yirui/openalexdata/data/output/computer_science")
-        print("         python analyze_professor_topics.py data/output/computer_science data/computer_science_relationships.json output_topics")
-        print("         python analyze_professor_topics.py data/output/computer_science/professor_detail.json")
-        sys.exit(1)
+    parser = argparse.ArgumentParser(
+        description='Analyze professor research topics',
+        formatter_class=argparse.RawDescriptionHelpFormatter,
+        epilog=("Example: python analyze_professor_topics.py /mnt/ssd/yirui/openalexdata/data/output/computer_science\n"
+                "         python analyze_professor_topics.py data/output/computer_science data/computer_science_relationships.json output_topics\n"
+                "         python analyze_professor_topics.py data/output/computer_science/professor_detail.json"))
+    parser.add_argument('input_path', help='Professor *_detail.json file or folder of them')
+    parser.add_argument('relationships_file', nargs='?', default='data/computer_science_relationships.json', help='Hierarchy relationships JSON file')
+    parser.add_argument('output_folder', nargs='?', default='professor_topics_output', help='Output folder')
+    parser.add_argument('--compress', action='store_true', help='Compress output files with zstd (requires zstandard library)')
+    parser.add_argument('--jobs', type=int, default=None, help='Number of worker processes for folder mode (default: CPU count)')
+    parser.add_argument('--verbose', action='store_true', help='Log per-file progress')
+    
+    args = parser.parse_args()
+    
+    logging.basicConfig(level=logging.DEBUG if args.verbose else logging.INFO, format='%(message)s')
+    
+    input_path = args.input_path
+    relationships_file = args.relationships_file
+    output_folder = args.output_folder
+    compress = args.compress
     
-    input_path = sys.argv[1]
-    relationships_file = sys.argv[2] if len(sys.argv) > 2 else "data/computer_science_relationships.json"
-    output_folder = sys.argv[3] if len(sys.argv) > 3 else "professor_topics_output"
+    if compress and not ZSTD_AVAILABLE:
+        logger.warning("zstandard not available, saving uncompressed output. Install with: pip install zstandard")
+        compress = False
     
     if os.path.exists(relationships_file):
-        print(f"Using relationships from: {relationships_file}")
+        logger.info("Using relationships from: %s", relationships_file)
     else:
-        print(f"Warning: Relationships file '{relationships_file}' not found, proceeding without hierarchical relationships")
+        logger.warning("Relationships file '%s' not found, proceeding without hierarchical relationships", relationships_file)
     
     # 检查输入是文件还是文件夹
     if os.path.isfile(input_path) and input_path.endswith('_detail.json'):
         # 处理单个文件
-        print(f"Processing single file: {input_path}")
+        logger.info("Processing single file: %s", input_path)
         os.makedirs(output_folder, exist_ok=True)
         
         try:
-            result = analyze_professor_topics(input_path, relationships_file)
+            result = analyze_professor_topics(input_path, _load_relationships(relationships_file))
             if result:
                 prof_name = result['professor_info'].get('name', 'unknown')
                 prof_id = result['professor_info'].get('author_id', 'unknown')
                 safe_name = prof_name.replace(' ', '_').replace('/', '_').replace('\\', '_')
                 output_file = os.path.join(output_folder, f"topics_analysis_{safe_name}_{prof_id}.json")
                 
-                save_results(result, output_file)
-                print(f"✓ Professor: {prof_name}")
-                print(f"  Topics: {result['topic_analysis']['total_topics']}, Papers: {result['professor_info'].get('total_papers', 0)}")
+                save_results(result, output_file, compress)
+                logger.info("Results saved to: %s", output_file)
+                logger.info("✓ Professor: %s", prof_name)
+                logger.info("  Topics: %s, Papers: %s", result['topic_analysis']['total_topics'], result['professor_info'].get('total_papers', 0))
             else:
-                print("Error: Failed to analyze the file")
+                logger.error("Failed to analyze the file")
         except Exception as e:
-            print(f"Error processing file: {e}")
-            import traceback
-            traceback.print_exc()
+            logger.exception("Error processing file: %s", e)
     
     elif os.path.isdir(input_path):
         # 处理整个文件夹
-        process_folder(input_path, relationships_file, output_folder)
+        process_folder(input_path, relationships_file, output_folder, jobs=args.jobs, compress=compress)
     else:
-        print(f"Error: '{input_path}' is not a valid file or directory")
+        logger.error("'%s' is not a valid file or directory", input_path)
         sys.exit(1)
 
 if __name__ == "__main__":
@@ -8,15 +8,21 @@ Download all papers where is_oa is true
 import json
 import os
 import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 import time
 import re
+import threading
+import zlib
+import shutil
 from pathlib import Path
 from urllib.parse import urlparse, urljoin
 import logging
-from concurrent.futures import ThreadPoolExecutor, as_completed
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor, wait, FIRST_COMPLETED
+from itertools import islice
 import argparse
+import functools
 import hashlib
-import random
 
 # Try to import cloudscraper, fallback to requests if not available
 try:
@@ -26,6 +32,35 @@ except ImportError:
     CLOUDSCRAPER_AVAILABLE = False
     logging.warning("cloudscraper not available. Install with: pip install cloudscraper")
 
+# Optional faster JSON parsing: orjson for whole-file loads, ijson for streaming very large files
+try:
+    import orjson
+    ORJSON_AVAILABLE = True
+except ImportError:
+    ORJSON_AVAILABLE = False
+
+try:
+    import ijson
+    IJSON_AVAILABLE = True
+except ImportError:
+    IJSON_AVAILABLE = False
+
+# Professor JSON files larger than this are stream-parsed with ijson (when available)
+STREAM_PARSE_THRESHOLD = 256 * 1024 * 1024
+
+# Browser identities to spread requests over; each paper always uses the same one
+USER_AGENTS = (
+    'Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36',
+    'Mozilla/5.0 (Windows NT 10.0; Win64; x64; rv:121.0) Gecko/20100101 Firefox/121.0',
+    'Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/605.1.15 (KHTML, like Gecko) Version/17.2 Safari/605.1.15',
+)
+
+# Minimum seconds between request starts to the same host, for publishers that need pacing
+HOST_MIN_INTERVALS = {'acm.org': 1.5}
+
+# Domains served through the cloudscraper session (matched against the end of the host)
+CLOUDFLARE_SESSION_DOMAINS = ('acm.org',)
+
 # Setup logging
 logging.basicConfig(
     level=logging.INFO,
@@ -41,6 +76,145 @@ logging.getLogger().setLevel(logging.INFO)
 for handler in logging.getLogger().handlers:
     handler.setLevel(logging.INFO)
 
+# Content-Range header of a 206 response: "bytes start-end/total" (total may be "*")
+CONTENT_RANGE_RE = re.compile(r'bytes\s+(\d+)-(\d+)/(\d+|\*)')
+
+
+def parse_content_range(value):
+    """Return (start, total) from a Content-Range header, or None if it cannot be parsed"""
+    match = CONTENT_RANGE_RE.match(value or '')
+    if not match:
+        return None
+    total = match.group(3)
+    return int(match.group(1)), (int(total) if total != '*' else None)
+
+
+# Leading four bytes of a downloaded file -> detected format
+FILE_MAGIC = {
+    b'%PDF': 'pdf',
+    b'<!DO': 'html',
+    b'<htm': 'html',
+    b'<HTM': 'html',
+    b'erro': 'text_error',
+    b'Erro': 'text_error',
+    b'<?xm': 'xml',
+    b'<xml': 'xml',
+    b'\x89PNG': 'image',
+    b'GIF8': 'image',
+}
+
+FILE_MAGIC_REASONS = {
+    'text_error': "Plain text error message",
+    'xml': "XML content (likely API response or error message)",
+    'image': "Image file (PNG/GIF), not a document",
+}
+
+# Keyword groups for classifying HTML pages, in priority order; matched case-insensitively
+# on the raw bytes so the page never has to be decoded
+HTML_PAGE_KEYWORDS_RE = re.compile(
+    rb'(error|not found)|(access denied|forbidden)|(captcha|robot)|(login|sign in)|(redirect|moved)',
+    re.IGNORECASE
+)
+
+HTML_PAGE_REASONS = (
+    "HTML error page (likely 'file not found' or server error)",
+    "HTML access denied page (likely permission issue)",
+    "HTML captcha/anti-bot page (likely blocked by anti-bot protection)",
+    "HTML login page (likely requires authentication)",
+    "HTML redirect page (likely URL has changed)",
+)
+
+
+@functools.lru_cache(maxsize=256)
+def _netloc(url):
+    """Lower-cased host of a URL (port stripped); cached since each URL is inspected several times per download"""
+    return urlparse(url).hostname or ''
+
+
+def _stream_papers(json_file):
+    """Yield papers one at a time from a professor JSON file using ijson"""
+    with open(json_file, 'rb') as f:
+        yield from ijson.items(f, 'papers.item')
+
+def load_professor_file(json_file):
+    """Load a professor JSON file, returning (professor_info, iterable of papers)"""
+    if IJSON_AVAILABLE and os.path.getsize(json_file) > STREAM_PARSE_THRESHOLD:
+        with open(json_file, 'rb') as f:
+            professor_info = next(ijson.items(f, 'professor_info'), {})
+        return professor_info, _stream_papers(json_file)
+    
+    if ORJSON_AVAILABLE:
+        data = orjson.loads(Path(json_file).read_bytes())
+    else:
+        with open(json_file, 'r', encoding='utf-8') as f:
+            data = json.load(f)
+    return data.get('professor_info', {}), data.get('papers', [])
+
+def extract_paper_info_static(json_file):
+    """Extract paper information from JSON file including papers and cited_by_works (picklable for process pools)"""
+    try:
+        professor_info, papers = load_professor_file(json_file)
+        
+        professor_name = professor_info.get('name', 'Unknown')
+        department = professor_info.get('department', 'unknown')
+        
+        all_oa_papers = []
+        
+        # Process main papers
+        for paper in papers:
+            open_access = paper.get('open_access', {})
+            if open_access.get('is_oa') and open_access.get('oa_url'):
+                paper_info = create_paper_info(paper, professor_name, department, 'main_paper')
+                if paper_info:
+                    all_oa_papers.append(paper_info)
+            
+            # Process cited_by_works for each paper
+            cited_by_works = paper.get('cited_by_works', [])
+            for cited_work in cited_by_works:
+                cited_open_access = cited_work.get('open_access', {})
+                if cited_open_access.get('is_oa') and cited_open_access.get('oa_url'):
+                    cited_paper_info = create_paper_info(cited_work, professor_name, department, 'cited_by_work')
+                    if cited_paper_info:
+                        all_oa_papers.append(cited_paper_info)
+        
+        return all_oa_papers
+    
+    except Exception as e:
+        logging.error(f"Error parsing file {json_file}: {e}")
+        return []
+
+def create_paper_info(paper, professor_name, department, paper_type):
+    """Create paper info dictionary"""
+    open_access = paper.get('open_access', {})
+    
+    # Extract OpenAlex ID from the id field
+    paper_id = paper.get('id', '')
+    openalex_id = ''
+    
+    # Check if id is a URL and extract the W-number
+    if paper_id and isinstance(paper_id, str):
+        if 'openalex.org/' in paper_id:
+            # Extract the W-number from URL like "https://openalex.org/W2766540688"
+            openalex_id = paper_id.split('/')[-1]
+        else:
+            # If id is not a URL, use it as is
+            openalex_id = paper_id
+    
+    if not openalex_id:
+        return None
+    
+    return {
+        'title': paper.get('title', 'Unknown Title'),
+        'doi': paper.get('doi', ''),
+        'oa_url': open_access.get('oa_url'),
+        'professor': professor_name,
+        'department': department,
+        'paper_id': paper.get('id', ''),
+        'openalex_id': openalex_id,
+        'publication_date': paper.get('publication_date', ''),
+        'paper_type': paper_type
+    }
+
 class PaperDownloader:
     def __init__(self, output_dir="output", download_dir="/mnt/data/taxonomy/computer_science", max_workers=5, use_cloudscraper=True):
         self.output_dir = Path(output_dir)
@@ -51,14 +225,19 @@ class PaperDownloader:
         # Create download directory
         self.download_dir.mkdir(parents=True, exist_ok=True)
         
+        # Per-host pacing state: one lock per host and the time its last request started
+        self._host_locks = {}
+        self._host_last_request = {}
+        
         # Enhanced request headers to bypass anti-bot detection
         self.headers = {
-            'User-Agent': 'Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36',
+            'User-Agent': USER_AGENTS[0],
             'Accept': 'text/html,application/xhtml+xml,application/xml;q=0.9,image/webp,image/apng,*/*;q=0.8',
             'Accept-Language': 'en-US,en;q=0.9',
             'Accept-Encoding': 'gzip, deflate, br',
             'DNT': '1',
             'Connection': 'keep-alive',
+            'Keep-Alive': 'timeout=30, max=1000',
             'Upgrade-Insecure-Requests': '1',
             'Sec-Fetch-Dest': 'document',
             'Sec-Fetch-Mode': 'navigate',
@@ -66,9 +245,55 @@ class PaperDownloader:
             'Cache-Control': 'max-age=0'
         }
         
+        # Merged headers for publishers that need extra hints, built once instead of per paper
+        self._default_headers = self.headers
+        self._domain_headers = {
+            'acm.org': {
+                **self.headers,
+                'Referer': 'https://dl.acm.org/',
+                'Origin': 'https://dl.acm.org',
+                'Sec-Fetch-Site': 'same-origin',
+                'Sec-Fetch-User': '?1',
+                'Sec-Fetch-Dest': 'document',
+                'Sec-Fetch-Mode': 'navigate'
+            },
+            'ieee.org': {
+                **self.headers,
+                'Referer': 'https://ieeexplore.ieee.org/',
+                'Origin': 'https://ieeexplore.ieee.org',
+                'Sec-Fetch-Site': 'same-origin'
+            },
+            'springer.com': {
+                **self.headers,
+                'Referer': 'https://link.springer.com/',
+                'Origin': 'https://link.springer.com',
+                'Sec-Fetch-Site': 'same-origin'
+            },
+            'arxiv.org': {
+                **self.headers,
+                'Referer': 'https://arxiv.org/',
+                'Origin': 'https://arxiv.org',
+                'Sec-Fetch-Site': 'same-origin'
+            }
+        }
+        
+        # Every header set above in each User-Agent variant, indexed like USER_AGENTS
+        self._ua_headers = {
+            key: tuple({**headers, 'User-Agent': user_agent} for user_agent in USER_AGENTS)
+            for key, headers in [(None, self._default_headers), *self._domain_headers.items()]
+        }
+        
         # Initialize sessions
         self.requests_session = requests.Session()
         self.requests_session.headers.update(self.headers)
+        self.mount_pooled_adapter(self.requests_session)
+        
+        # Each download thread gets its own requests session (and connection pool) so workers
+        # do not contend on one pool; the creating thread keeps using requests_session
+        self._tls = threading.local()
+        self._tls.session = self.requests_session
+        self._thread_sessions = []
+        self._thread_sessions_lock = threading.Lock()
         
         # Initialize cloudscraper session if available
         if self.use_cloudscraper:
@@ -82,6 +307,7 @@ class PaperDownloader:
                     delay=2
                 )
                 self.cloudscraper_session.headers.update(self.headers)
+                self.mount_scraper_adapter(self.cloudscraper_session)
                 logging.info("Cloudscraper session initialized")
             except Exception as e:
                 logging.warning(f"Failed to initialize cloudscraper: {e}")
@@ -109,6 +335,50 @@ class PaperDownloader:
                 'integrity_failures': 0
             }
         }
+        # Guards stats updates made concurrently by download worker threads
+        self._stats_lock = threading.Lock()
+    
+    def pool_settings(self, shared=True):
+        """Connection pool sizes and retry policy for a session
+        
+        A session shared by all worker threads gets a pool sized to the worker count; a
+        session used by a single thread never holds more than one or two connections per host.
+        """
+        return {
+            'pool_connections': max(32, self.max_workers) if shared else 10,
+            'pool_maxsize': max(32, self.max_workers * 2) if shared else 2,
+            'max_retries': Retry(
+                total=3,
+                backoff_factor=0.5,
+                status_forcelist=[429, 500, 502, 503, 504],
+                allowed_methods=["GET", "HEAD"],
+                raise_on_status=False
+            )
+        }
+    
+    def mount_pooled_adapter(self, session):
+        """Mount an HTTPAdapter with the retry policy and a small pool on a per-thread session"""
+        adapter = HTTPAdapter(**self.pool_settings(shared=False))
+        session.mount('https://', adapter)
+        session.mount('http://', adapter)
+    
+    def mount_scraper_adapter(self, scraper):
+        """Enlarge the cloudscraper session's connection pool while keeping its TLS adapter
+        
+        create_scraper mounts a CipherSuiteAdapter on https:// for a browser-like TLS fingerprint;
+        a plain HTTPAdapter there would fall back to stock urllib3 TLS, so the adapter is rebuilt
+        with the same TLS settings and only the pool sizes and retries changed.
+        """
+        tls_adapter = scraper.adapters['https://']
+        scraper.mount('https://', cloudscraper.CipherSuiteAdapter(
+            ssl_context=tls_adapter.ssl_context,
+            cipherSuite=tls_adapter.cipherSuite,
+            ecdhCurve=tls_adapter.ecdhCurve,
+            server_hostname=tls_adapter.server_hostname,
+            source_address=tls_adapter.source_address,
+            **self.pool_settings()
+        ))
+        scraper.mount('http://', HTTPAdapter(**self.pool_settings()))
     
     def get_json_files(self):
         """Get all JSON file paths from computer_science folder only"""
@@ -123,105 +393,66 @@ class PaperDownloader:
     
     def extract_paper_info(self, json_file):
         """Extract paper information from JSON file including papers and cited_by_works"""
-        try:
-            with open(json_file, 'r', encoding='utf-8') as f:
-                data = json.load(f)
-            
-            professor_name = data.get('professor_info', {}).get('name', 'Unknown')
-            department = data.get('professor_info', {}).get('department', 'unknown')
-            papers = data.get('papers', [])
-            
-            all_oa_papers = []
-            
-            # Process main papers
-            for paper in papers:
-                open_access = paper.get('open_access', {})
-                if open_access.get('is_oa') and open_access.get('oa_url'):
-                    paper_info = self.create_paper_info(paper, professor_name, department, 'main_paper')
-                    if paper_info:
-                        all_oa_papers.append(paper_info)
-                
-                # Process cited_by_works for each paper
-                cited_by_works = paper.get('cited_by_works', [])
-                for cited_work in cited_by_works:
-                    cited_open_access = cited_work.get('open_access', {})
-                    if cited_open_access.get('is_oa') and cited_open_access.get('oa_url'):
-                        cited_paper_info = self.create_paper_info(cited_work, professor_name, department, 'cited_by_work')
-                        if cited_paper_info:
-                            all_oa_papers.append(cited_paper_info)
-            
-            return all_oa_papers
-            
-        except Exception as e:
-            logging.error(f"Error parsing file {json_file}: {e}")
-            return []
+        return extract_paper_info_static(json_file)
     
     def create_paper_info(self, paper, professor_name, department, paper_type):
         """Create paper info dictionary"""
-        open_access = paper.get('open_access', {})
+        return create_paper_info(paper, professor_name, department, paper_type)
+    
+    def get_domain_specific_headers(self, url, openalex_id=None):
+        """Get domain-specific headers to bypass restrictions
         
-        # Extract OpenAlex ID from the id field
-        paper_id = paper.get('id', '')
-        openalex_id = ''
+        With an openalex_id the User-Agent is picked from USER_AGENTS by a stable hash of the ID,
+        so retries of the same paper keep the same identity. Hosts routed through the cloudscraper
+        session always keep its User-Agent, since Cloudflare clearance cookies are bound to it.
+        Returns one of the dicts precomputed in __init__; callers must not mutate it.
+        """
+        domain = _netloc(url)
+        domain_key = next((key for key in self._domain_headers if domain.endswith(key)), None)
+        cloudflare_host = domain.endswith(CLOUDFLARE_SESSION_DOMAINS) or 'cloudflare' in domain
         
-        # Check if id is a URL and extract the W-number
-        if paper_id and isinstance(paper_id, str):
-            if 'openalex.org/' in paper_id:
-                # Extract the W-number from URL like "https://openalex.org/W2766540688"
-                openalex_id = paper_id.split('/')[-1]
-            else:
-                # If id is not a URL, use it as is
-                openalex_id = paper_id
+        if openalex_id and not cloudflare_host:
+            variants = self._ua_headers[domain_key]
+            return variants[zlib.crc32(openalex_id.encode()) % len(variants)]
         
-        if not openalex_id:
-            return None
-            
-        return {
-            'title': paper.get('title', 'Unknown Title'),
-            'doi': paper.get('doi', ''),
-            'oa_url': open_access.get('oa_url'),
-            'professor': professor_name,
-            'department': department,
-            'paper_id': paper.get('id', ''),
-            'openalex_id': openalex_id,
-            'publication_date': paper.get('publication_date', ''),
-            'paper_type': paper_type
-        }
+        if domain_key is None:
+            return self._default_headers
+        return self._domain_headers[domain_key]
     
-    def get_domain_specific_headers(self, url):
-        """Get domain-specific headers to bypass restrictions"""
-        domain = urlparse(url).netloc.lower()
-        headers = self.headers.copy()
-        
-        if 'acm.org' in domain:
-            headers.update({
-                'Referer': 'https://dl.acm.org/',
-                'Origin': 'https://dl.acm.org',
-                'Sec-Fetch-Site': 'same-origin',
-                'Sec-Fetch-User': '?1',
-                'Sec-Fetch-Dest': 'document',
-                'Sec-Fetch-Mode': 'navigate'
-            })
-        elif 'ieee.org' in domain:
-            headers.update({
-                'Referer': 'https://ieeexplore.ieee.org/',
-                'Origin': 'https://ieeexplore.ieee.org',
-                'Sec-Fetch-Site': 'same-origin'
-            })
-        elif 'springer.com' in domain:
-            headers.update({
-                'Referer': 'https://link.springer.com/',
-                'Origin': 'https://link.springer.com',
-                'Sec-Fetch-Site': 'same-origin'
-            })
-        elif 'arxiv.org' in domain:
-            headers.update({
-                'Referer': 'https://arxiv.org/',
-                'Origin': 'https://arxiv.org',
-                'Sec-Fetch-Site': 'same-origin'
-            })
+    def throttle_host(self, url):
+        """Space out requests to hosts listed in HOST_MIN_INTERVALS; other hosts are never delayed"""
+        host = _netloc(url)
+        interval = next((v for k, v in HOST_MIN_INTERVALS.items() if host.endswith(k)), None)
+        if interval is None:
+            return
         
-        return headers
+        with self._host_locks.setdefault(host, threading.Lock()):
+            gap = time.monotonic() - self._host_last_request.get(host, 0.0)
+            if gap < interval:
+                time.sleep(interval - gap)
+            self._host_last_request[host] = time.monotonic()
+    
+    def preallocate_file(self, fd, size):
+        """Preallocate size bytes for a freshly truncated file and hint sequential writes; returns True if allocated"""
+        if not hasattr(os, 'posix_fallocate'):
+            return False
+        try:
+            os.posix_fallocate(fd, 0, size)
+            if hasattr(os, 'posix_fadvise'):
+                os.posix_fadvise(fd, 0, size, os.POSIX_FADV_SEQUENTIAL)
+            return True
+        except OSError as e:
+            # Not supported by every filesystem; fall back to growing the file while writing
+            logging.debug(f"Preallocation failed: {e}")
+            return False
+    
+    def has_domain_cookies(self, session, domain):
+        """Check whether the session already holds cookies set by the given domain"""
+        try:
+            return any(cookie.domain.endswith(domain) for cookie in session.cookies)
+        except RuntimeError:
+            # Jar modified by another worker while iterating; treat as no cookies
+            return False
     
     def download_file(self, url, headers, timeout=60):
         """Download file with simple error handling"""
@@ -229,8 +460,16 @@ class PaperDownloader:
             # Use the appropriate session to download
             session = self.get_session_for_domain(url)
             
+            # Only send headers that differ from the session defaults, so the
+            # session-level keep-alive settings are never overridden per request
+            headers = {k: v for k, v in headers.items() if session.headers.get(k) != v}
+            
+            # Pace requests per host instead of sleeping in every worker
+            self.throttle_host(url)
+            
             # For ACM URLs, try to access the abstract page first to establish session
-            if 'dl.acm.org' in url and '/doi/pdf/' in url:
+            # (only needed until the session holds ACM cookies)
+            if 'dl.acm.org' in url and '/doi/pdf/' in url and not self.has_domain_cookies(session, 'acm.org'):
                 # Extract DOI from PDF URL
                 doi = url.split('/doi/pdf/')[-1]
                 abstract_url = f"https://dl.acm.org/doi/{doi}"
@@ -247,9 +486,6 @@ class PaperDownloader:
                         logging.debug(f"ACM abstract page returned status {abstract_response.status_code}")
                 except Exception as e:
                     logging.debug(f"Failed to access ACM abstract page: {e}")
-                
-                # Add small delay to mimic human behavior
-                time.sleep(random.uniform(1, 3))
             
             # Attempt download
             response = session.get(
@@ -283,63 +519,48 @@ class PaperDownloader:
         
         file_size = file_path.stat().st_size
         
-        # Check if file is too small (likely incomplete)
-        if file_size < 1024:  # Less than 1KB
-            return False, f"File too small ({file_size} bytes), likely incomplete or error page"
-        
         # Check if file appears to be a valid document
         try:
             with open(file_path, 'rb') as f:
                 # Read more content for better analysis
                 content = f.read(1024)  # Read first 1KB for analysis
-                
-                # Check for PDF
-                if content.startswith(b'%PDF'):
-                    return True, "Valid PDF file"
-                
-                # Check for HTML content
-                if content.startswith(b'<!DOCTYPE') or content.startswith(b'<html') or content.startswith(b'<HTML'):
-                    # Try to determine what kind of HTML page this is
-                    content_str = content.decode('utf-8', errors='ignore').lower()
-                    
-                    if 'error' in content_str or 'not found' in content_str:
-                        return False, "HTML error page (likely 'file not found' or server error)"
-                    elif 'access denied' in content_str or 'forbidden' in content_str:
-                        return False, "HTML access denied page (likely permission issue)"
-                    elif 'captcha' in content_str or 'robot' in content_str:
-                        return False, "HTML captcha/anti-bot page (likely blocked by anti-bot protection)"
-                    elif 'login' in content_str or 'sign in' in content_str:
-                        return False, "HTML login page (likely requires authentication)"
-                    elif 'redirect' in content_str or 'moved' in content_str:
-                        return False, "HTML redirect page (likely URL has changed)"
-                    else:
-                        return False, "HTML page (likely not a PDF document)"
-                
-                # Check for plain text error messages
-                if content.startswith(b'error') or content.startswith(b'Error'):
-                    return False, "Plain text error message"
-                
-                # Check for XML content
-                if content.startswith(b'<?xml') or content.startswith(b'<xml'):
-                    return False, "XML content (likely API response or error message)"
-                
-                # Check for JSON content
-                if content.startswith(b'{') or content.startswith(b'['):
-                    try:
-                        json.loads(content[:100])  # Try to parse as JSON
-                        return False, "JSON content (likely API response or error message)"
-                    except:
-                        pass
-                
-                # Check for other binary formats
-                if content.startswith(b'\x89PNG') or content.startswith(b'GIF8'):
-                    return False, "Image file (PNG/GIF), not a document"
-                
-                # If we can't determine the format
-                return False, f"Unknown file format (first 4 bytes: {content[:4].hex()})"
-                
         except Exception as e:
             return False, f"Error reading file: {str(e)}"
+        
+        return self.verify_content(content, file_size)
+    
+    def verify_content(self, content, file_size):
+        """Classify a file from its first 1KB and total size, without touching the disk"""
+        # Check if file is too small (likely incomplete)
+        if file_size < 1024:  # Less than 1KB
+            return False, f"File too small ({file_size} bytes), likely incomplete or error page"
+        
+        # Identify the format from its leading bytes with one dictionary lookup
+        kind = FILE_MAGIC.get(content[:4])
+        if kind == 'pdf':
+            return True, "Valid PDF file"
+        
+        if kind == 'html':
+            # Try to determine what kind of HTML page this is
+            # Single scan for all keywords; the lowest group number wins, as in the original if/elif order
+            matched = {m.lastindex for m in HTML_PAGE_KEYWORDS_RE.finditer(content)}
+            if matched:
+                return False, HTML_PAGE_REASONS[min(matched) - 1]
+            return False, "HTML page (likely not a PDF document)"
+        
+        if kind is not None:
+            return False, FILE_MAGIC_REASONS[kind]
+        
+        # Check for JSON content
+        if content.startswith(b'{') or content.startswith(b'['):
+            try:
+                json.loads(content[:100])  # Try to parse as JSON
+                return False, "JSON content (likely API response or error message)"
+            except:
+                pass
+        
+        # If we can't determine the format
+        return False, f"Unknown file format (first 4 bytes: {content[:4].hex()})"
     
     def convert_arxiv_url_to_pdf(self, url):
         """Convert arXiv abstract URL to PDF download URL"""
@@ -349,8 +570,34 @@ class PaperDownloader:
             return pdf_url
         return url
 
-    def download_paper(self, paper_info):
-        """Download a single paper PDF with simplified error handling"""
+    def record_stat(self, key, error_type=None):
+        """Increment a download counter (and optionally an error counter); safe to call from worker threads"""
+        with self._stats_lock:
+            self.stats[key] += 1
+            if error_type in self.stats['errors']:
+                self.stats['errors'][error_type] += 1
+    
+    def get_existing_ids(self):
+        """Collect OpenAlex IDs of verified PDFs in the download directory with a single scandir pass
+        
+        Only PDFs with a .pdf.ok marker count; unmarked files from older runs are left to
+        download_paper, which verifies them once.
+        """
+        pdf_ids = set()
+        marked_ids = set()
+        with os.scandir(self.download_dir) as it:
+            for entry in it:
+                if entry.name.endswith('.pdf.ok'):
+                    marked_ids.add(entry.name[:-len('.pdf.ok')])
+                elif entry.name.endswith('.pdf') and entry.is_file():
+                    pdf_ids.add(entry.name[:-len('.pdf')])
+        return pdf_ids & marked_ids
+    
+    def download_paper(self, paper_info, existing_ids=None):
+        """Download a single paper PDF with simplified error handling
+        
+        existing_ids: optional set from get_existing_ids(); papers in it (verified PDFs) are skipped without touching the disk
+        """
         try:
             url = paper_info['oa_url']
             title = paper_info['title']
@@ -365,35 +612,63 @@ class PaperDownloader:
             # Use OpenAlex ID as filename
             if not openalex_id:
                 logging.error(f"SKIP: No OpenAlex ID for paper: {title[:50]}")
-                self.stats['skipped'] += 1
+                self.record_stat('skipped')
                 return False
             
+            # IDs in the set have a .pdf.ok marker, so their PDFs already passed the integrity check
+            if existing_ids is not None and openalex_id in existing_ids:
+                logging.info(f"SKIP: {openalex_id} - File already exists ({paper_type})")
+                self.record_stat('skipped')
+                return True
+            
             filename = f"{openalex_id}.pdf"
             
             # Save directly to the download directory (no subdirectories)
             save_path = self.download_dir / filename
             
+            # Zero-byte marker written once the PDF has passed the integrity check
+            ok_path = save_path.with_suffix(save_path.suffix + '.ok')
+            
             # Skip if file already exists and is valid
             if save_path.exists():
+                if ok_path.exists():
+                    logging.info(f"SKIP: {openalex_id} - File already exists ({paper_type})")
+                    self.record_stat('skipped')
+                    return True
+                
+                # Files from older runs have no marker; check them once and remember the result
                 is_valid, reason = self.verify_file_integrity(save_path)
                 if is_valid:
+                    ok_path.touch()
                     logging.info(f"SKIP: {openalex_id} - File already exists ({paper_type})")
-                    self.stats['skipped'] += 1
+                    self.record_stat('skipped')
                     return True
                 else:
                     save_path.unlink(missing_ok=True)  # Remove invalid file
             
             # Get domain-specific headers
-            headers = self.get_domain_specific_headers(url)
+            headers = self.get_domain_specific_headers(url, openalex_id)
+            
+            # Resume a previously interrupted download from where the temp file stopped
+            temp_path = save_path.with_suffix(save_path.suffix + '.tmp')
+            resume_from = temp_path.stat().st_size if temp_path.exists() else 0
+            if resume_from:
+                # Uncompressed transfer so byte offsets match what is already on disk
+                headers = {**headers, 'Range': f'bytes={resume_from}-', 'Accept-Encoding': 'identity'}
             
             # Download file
             response, error_type = self.download_file(url, headers)
             
+            if not response and resume_from and error_type == 'http_416':
+                # Stale partial file the server cannot continue; start over
+                temp_path.unlink(missing_ok=True)
+                resume_from = 0
+                headers = self.get_domain_specific_headers(url, openalex_id)
+                response, error_type = self.download_file(url, headers)
+            
             if not response:
                 logging.error(f"FAIL: {openalex_id} - {error_type} ({paper_type})")
-                self.stats['failed'] += 1
-                if error_type in self.stats['errors']:
-                    self.stats['errors'][error_type] += 1
+                self.record_stat('failed', error_type)
                 return False
             
             # Get expected file size if available
@@ -401,23 +676,73 @@ class PaperDownloader:
             if expected_size:
                 expected_size = int(expected_size)
             
+            # Only append when the server really continues at our offset; a plain 200
+            # (or a 206 for some other range) means the body has to be written from scratch
+            if resume_from:
+                content_range = parse_content_range(response.headers.get('content-range'))
+                if response.status_code == 206 and content_range and content_range[0] == resume_from:
+                    logging.info(f"RESUME: {openalex_id} from byte {resume_from} ({paper_type})")
+                    expected_size = content_range[1]
+                else:
+                    if response.status_code == 206:
+                        response.close()
+                        response, error_type = self.download_file(url, self.get_domain_specific_headers(url, openalex_id))
+                        if not response:
+                            logging.error(f"FAIL: {openalex_id} - {error_type} ({paper_type})")
+                            self.record_stat('failed', error_type)
+                            return False
+                        expected_size = response.headers.get('content-length')
+                        if expected_size:
+                            expected_size = int(expected_size)
+                    resume_from = 0
+            
             # Save file with integrity check
-            temp_path = save_path.with_suffix(save_path.suffix + '.tmp')
+            # Copy the body straight from the urllib3 stream in 1 MiB reads, bypassing
+            # iter_content's per-chunk generator overhead (gzip/deflate still decoded)
+            flags = os.O_WRONLY | os.O_CREAT | (os.O_APPEND if resume_from else os.O_TRUNC)
+            fd = os.open(temp_path, flags, 0o644)
+            response.raw.decode_content = True
             
-            with open(temp_path, 'wb') as f:
-                downloaded_size = 0
-                for chunk in response.iter_content(chunk_size=8192):
-                    if chunk:
+            # Reserve the whole file up front when its final size is known, so the filesystem
+            # allocates one extent instead of growing the file chunk by chunk
+            preallocated = (
+                not resume_from and expected_size
+                and not response.headers.get('content-encoding')
+                and self.preallocate_file(fd, expected_size)
+            )
+            
+            with os.fdopen(fd, 'wb') as f:
+                try:
+                    # Keep the first 1KB of the body in memory for the integrity check
+                    head = b''
+                    while len(head) < 1024:
+                        chunk = response.raw.read(1 << 20)
+                        if not chunk:
+                            break
                         f.write(chunk)
-                        downloaded_size += len(chunk)
+                        head += chunk[:1024 - len(head)]
+                    shutil.copyfileobj(response.raw, f, 1 << 20)
+                    f.flush()
+                    downloaded_size = f.tell()
+                finally:
+                    if preallocated:
+                        # Drop any reserved tail left by a short or interrupted transfer,
+                        # so the temp file size stays a valid resume offset
+                        f.flush()
+                        os.ftruncate(fd, f.tell())
             
-            # Verify file integrity
-            is_valid, reason = self.verify_file_integrity(temp_path, expected_size)
+            # Verify file integrity; a resumed file starts with bytes from the earlier attempt,
+            # so only a fresh download can be checked from memory
+            if resume_from:
+                is_valid, reason = self.verify_file_integrity(temp_path, expected_size)
+            else:
+                is_valid, reason = self.verify_content(head, downloaded_size)
             if is_valid:
                 # Move temp file to final location
                 temp_path.rename(save_path)
+                ok_path.touch()
                 logging.info(f"SUCCESS: {openalex_id} ({paper_type})")
-                self.stats['downloaded'] += 1
+                self.record_stat('downloaded')
                 return True
             else:
                 # File is invalid, analyze the reason
@@ -426,15 +751,14 @@ class PaperDownloader:
                 # Remove invalid file
                 temp_path.unlink(missing_ok=True)
                 
-                self.stats['failed'] += 1
-                self.stats['errors']['integrity_failures'] += 1
+                self.record_stat('failed', 'integrity_failures')
                 return False
             
         except Exception as e:
             openalex_id = paper_info.get('openalex_id', 'Unknown')
             paper_type = paper_info.get('paper_type', 'unknown')
             logging.error(f"FAIL: {openalex_id} - Exception: {e} ({paper_type})")
-            self.stats['failed'] += 1
+            self.record_stat('failed')
             return False
     
     def process_all_files(self):
@@ -444,53 +768,68 @@ class PaperDownloader:
         
         logging.info(f"Found {len(json_files)} JSON files")
         
-        all_oa_papers = []
-        
-        # Extract all open access paper information
-        for json_file in json_files:
-            oa_papers = self.extract_paper_info(json_file)
-            all_oa_papers.extend(oa_papers)
-        
-        # Count papers by type
-        main_papers = [p for p in all_oa_papers if p.get('paper_type') == 'main_paper']
-        cited_by_works = [p for p in all_oa_papers if p.get('paper_type') == 'cited_by_work']
+        # Extract all open access paper information, parsing files in parallel processes,
+        # and remove duplicates based on OpenAlex ID as results arrive
+        unique_papers = {}
+        main_papers = 0
+        cited_by_works = 0
         
-        self.stats['oa_papers'] = len(main_papers)
-        self.stats['oa_cited_by_works'] = len(cited_by_works)
+        with ProcessPoolExecutor(max_workers=os.cpu_count()) as executor:
+            for oa_papers in executor.map(extract_paper_info_static, json_files, chunksize=8):
+                for paper in oa_papers:
+                    # Count papers by type
+                    paper_type = paper.get('paper_type')
+                    if paper_type == 'main_paper':
+                        main_papers += 1
+                    elif paper_type == 'cited_by_work':
+                        cited_by_works += 1
+                    
+                    openalex_id = paper.get('openalex_id')
+                    if openalex_id and openalex_id not in unique_papers:
+                        unique_papers[openalex_id] = paper
         
-        logging.info(f"Found {len(main_papers)} open access main papers")
-        logging.info(f"Found {len(cited_by_works)} open access cited_by_works")
-        logging.info(f"Total open access papers to download: {len(all_oa_papers)}")
+        self.stats['oa_papers'] = main_papers
+        self.stats['oa_cited_by_works'] = cited_by_works
         
-        # Remove duplicates based on OpenAlex ID
-        unique_papers = {}
-        for paper in all_oa_papers:
-            openalex_id = paper.get('openalex_id')
-            if openalex_id and openalex_id not in unique_papers:
-                unique_papers[openalex_id] = paper
+        logging.info(f"Found {main_papers} open access main papers")
+        logging.info(f"Found {cited_by_works} open access cited_by_works")
+        logging.info(f"Total open access papers to download: {main_papers + cited_by_works}")
         
         all_oa_papers = list(unique_papers.values())
         logging.info(f"After removing duplicates: {len(all_oa_papers)} unique papers")
         
         # Use multi-threading for downloads
+        self.download_papers(all_oa_papers)
+        
+        # Print statistics
+        self.print_stats()
+    
+    def download_papers(self, papers):
+        """Download papers concurrently, keeping only a bounded number of tasks in flight"""
+        papers = iter(papers)
+        existing_ids = self.get_existing_ids()
+        
         with ThreadPoolExecutor(max_workers=self.max_workers) as executor:
-            # Submit all download tasks
+            # Submit a small window of tasks up front and top it up as tasks finish,
+            # instead of creating a future for every paper at once
             future_to_paper = {
-                executor.submit(self.download_paper, paper): paper 
-                for paper in all_oa_papers
+                executor.submit(self.download_paper, paper, existing_ids): paper
+                for paper in islice(papers, self.max_workers * 2)
             }
             
-            # Process completed tasks
-            for future in as_completed(future_to_paper):
-                paper = future_to_paper[future]
-                try:
-                    future.result()
-                except Exception as e:
-                    openalex_id = paper.get('openalex_id', 'Unknown')
-                    logging.error(f"FAIL: {openalex_id} - Task exception: {e}")
-        
-        # Print statistics
-        self.print_stats()
+            while future_to_paper:
+                done, _ = wait(future_to_paper, return_when=FIRST_COMPLETED)
+                for future in done:
+                    paper = future_to_paper.pop(future)
+                    try:
+                        future.result()
+                    except Exception as e:
+                        openalex_id = paper.get('openalex_id', 'Unknown')
+                        logging.error(f"FAIL: {openalex_id} - Task exception: {e}")
+                    
+                    next_paper = next(papers, None)
+                    if next_paper is not None:
+                        future_to_paper[executor.submit(self.download_paper, next_paper, existing_ids)] = next_paper
     
     def print_stats(self):
         """Print statistics"""
@@ -507,18 +846,30 @@ class PaperDownloader:
         logging.info("=" * 50)
         logging.info("🎉 All papers processed! Download script finished.")
 
+    def get_thread_session(self):
+        """Return the calling thread's requests session, creating it on first use"""
+        session = getattr(self._tls, 'session', None)
+        if session is None:
+            session = requests.Session()
+            session.headers.update(self.headers)
+            self.mount_pooled_adapter(session)
+            self._tls.session = session
+            with self._thread_sessions_lock:
+                self._thread_sessions.append(session)
+        return session
+    
     def get_session_for_domain(self, url):
         """Get the appropriate session for a given domain"""
-        domain = urlparse(url).netloc.lower()
+        domain = _netloc(url)
         
         # Use cloudscraper for ACM and other Cloudflare-protected sites
-        if self.use_cloudscraper and ('acm.org' in domain or 'cloudflare' in domain):
+        if self.use_cloudscraper and (domain.endswith(CLOUDFLARE_SESSION_DOMAINS) or 'cloudflare' in domain):
             if hasattr(self, 'cloudscraper_session') and self.cloudscraper_session:
                 return self.cloudscraper_session
             else:
-                return self.requests_session
+                return self.get_thread_session()
         else:
-            return self.requests_session
+            return self.get_thread_session()
     
     def cleanup(self):
         """Clean up resources"""
@@ -528,6 +879,12 @@ class PaperDownloader:
         except Exception as e:
             logging.warning(f"Error closing requests session: {e}")
         
+        for session in getattr(self, '_thread_sessions', []):
+            try:
+                session.close()
+            except Exception as e:
+                logging.warning(f"Error closing worker requests session: {e}")
+        
         try:
             if hasattr(self, 'cloudscraper_session') and self.cloudscraper_session:
                 self.cloudscraper_session.close()
@@ -597,19 +954,7 @@ def main():
                 downloader.stats['oa_papers'] = len(oa_papers)
                 downloader.stats['total_files'] = 1
                 
-                with ThreadPoolExecutor(max_workers=args.max_workers) as executor:
-                    future_to_paper = {
-                        executor.submit(downloader.download_paper, paper): paper 
-                        for paper in oa_papers
-                    }
-                    
-                    for future in as_completed(future_to_paper):
-                        paper = future_to_paper[future]
-                        try:
-                            future.result()
-                        except Exception as e:
-                            openalex_id = paper.get('openalex_id', 'Unknown')
-                            logging.error(f"FAIL: {openalex_id} - Task exception: {e}")
+                downloader.download_papers(oa_papers)
                 
                 downloader.print_stats()
             else:
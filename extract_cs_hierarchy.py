@@ -16,61 +16,71 @@ Example: python extract_hierarchy.py "Computer Science"
 import json
 import sys
 import os
-from collections import defaultdict, OrderedDict
+from collections import Counter, defaultdict, OrderedDict
+from itertools import chain
+
+# Optional faster JSON serialization, falls back to the standard json module
+try:
+    import orjson
+    ORJSON_AVAILABLE = True
+except ImportError:
+    ORJSON_AVAILABLE = False
+
+# field.txt column holding the name at each level, in the order levels are checked
+LEVEL_NAME_COLUMNS = (('domain', 7), ('field', 5), ('subfield', 3))
+
+# OpenAlex ID prefixes; IDs are built by concatenating the original ID from field.txt
+DOMAIN_URL_PREFIX = "https://openalex.org/domains/"
+FIELD_URL_PREFIX = "https://openalex.org/fields/"
+SUBFIELD_URL_PREFIX = "https://openalex.org/subfields/"
+TOPIC_URL_PREFIX = "https://openalex.org/T"
+
+# Node name -> filename mapping: spaces become underscores, '&' becomes 'and',
+# commas and parentheses are dropped
+FILENAME_TRANSLATION = str.maketrans({' ': '_', '&': 'and', ',': None, '(': None, ')': None})
 
 def extract_hierarchy(target_node):
     """Extract hierarchy starting from the target node"""
-    entities = []
     relationships = []
     
-    # Track unique entities to avoid duplicates
-    seen_entities = set()
+    # Entities per level, keyed by original ID; a key that is already present is a duplicate
+    entities_by_type = {'domain': {}, 'field': {}, 'subfield': {}, 'topic': {}}
+    domains = entities_by_type['domain']
+    fields = entities_by_type['field']
+    subfields = entities_by_type['subfield']
+    topics = entities_by_type['topic']
     
-    # Determine what level the target node is at
+    # Level of the target node (and its name column), detected from the first row that mentions it
     target_level = None
-    target_match_field = None
+    target_col = None
     
     print(f"Searching for node: '{target_node}'...")
     
-    # First pass: determine the target node level and matching field
-    with open('data/field.txt', 'r', encoding='utf-8') as f:
+    # Single streaming pass: detect the target level and extract the hierarchy in the same loop
+    with open('data/field.txt', 'r', encoding='utf-8', buffering=1 << 20) as f:
         for line_num, line in enumerate(f, 1):
+            # A row can only match if the node name occurs somewhere in the line; this C-level
+            # substring scan lets most rows skip tokenization entirely
+            if target_node not in line:
+                continue
+            
             try:
-                row = line.strip().split('\t')
+                # Only the first 11 columns are used, so stop splitting after them
+                row = line.strip().split('\t', 11)
                 if len(row) < 11:
                     continue
                 
-                domain_name = row[7]
-                field_name = row[5]
-                subfield_name = row[3]
+                if target_level is None:
+                    for level, col in LEVEL_NAME_COLUMNS:
+                        if row[col] == target_node:
+                            target_level, target_col = level, col
+                            break
+                    else:
+                        continue
+                    print(f"Found '{target_node}' at level: {target_level}")
                 
-                if domain_name == target_node:
-                    target_level = 'domain'
-                    target_match_field = 'domain_name'
-                    break
-                elif field_name == target_node:
-                    target_level = 'field'
-                    target_match_field = 'field_name'
-                    break
-                elif subfield_name == target_node:
-                    target_level = 'subfield'
-                    target_match_field = 'subfield_name'
-                    break
-            except Exception as e:
-                continue
-    
-    if target_level is None:
-        print(f"Error: Node '{target_node}' not found in the data!")
-        return [], []
-    
-    print(f"Found '{target_node}' at level: {target_level}")
-    
-    # Second pass: extract hierarchy
-    with open('data/field.txt', 'r', encoding='utf-8') as f:
-        for line_num, line in enumerate(f, 1):
-            try:
-                row = line.strip().split('\t')
-                if len(row) < 11:
+                # Filter based on target node level: one comparison on the precomputed column
+                if row[target_col] != target_node:
                     continue
                 
                 # Extract data from row
@@ -86,48 +96,34 @@ def extract_hierarchy(target_node):
                 summary = row[9]
                 link = row[10]
                 
-                # Filter based on target node level
-                should_process = False
-                if target_level == 'domain' and domain_name == target_node:
-                    should_process = True
-                elif target_level == 'field' and field_name == target_node:
-                    should_process = True
-                elif target_level == 'subfield' and subfield_name == target_node:
-                    should_process = True
-                
-                if not should_process:
-                    continue
-                
                 print(f"Processing line {line_num}: {topic_name}")
                 
                 # Create OpenAlex ID format
-                domain_openalex_id = f"https://openalex.org/domains/{domain_id}"
-                field_openalex_id = f"https://openalex.org/fields/{field_id}"
-                subfield_openalex_id = f"https://openalex.org/subfields/{subfield_id}"
-                topic_openalex_id = f"https://openalex.org/T{topic_id}"
+                domain_openalex_id = DOMAIN_URL_PREFIX + domain_id
+                field_openalex_id = FIELD_URL_PREFIX + field_id
+                subfield_openalex_id = SUBFIELD_URL_PREFIX + subfield_id
+                topic_openalex_id = TOPIC_URL_PREFIX + topic_id
                 
                 # Add entities based on target level
                 if target_level == 'domain':
                     # Add domain entity (only once)
-                    if domain_openalex_id not in seen_entities:
-                        entities.append({
+                    if domain_id not in domains:
+                        domains[domain_id] = {
                             'id': domain_openalex_id,
                             'name': domain_name,
                             'original_id': domain_id,
                             'type': 'domain'
-                        })
-                        seen_entities.add(domain_openalex_id)
+                        }
                 
                 # Add field entity (if target is domain or field)
                 if target_level in ['domain', 'field']:
-                    if field_openalex_id not in seen_entities:
-                        entities.append({
+                    if field_id not in fields:
+                        fields[field_id] = {
                             'id': field_openalex_id,
                             'name': field_name,
                             'original_id': field_id,
                             'type': 'field'
-                        })
-                        seen_entities.add(field_openalex_id)
+                        }
                         
                         # Add domain -> field relationship if domain exists
                         if target_level == 'domain':
@@ -140,14 +136,13 @@ def extract_hierarchy(target_node):
                             })
                 
                 # Add subfield entity (always if we're processing this row)
-                if subfield_openalex_id not in seen_entities:
-                    entities.append({
+                if subfield_id not in subfields:
+                    subfields[subfield_id] = {
                         'id': subfield_openalex_id,
                         'name': subfield_name,
                         'original_id': subfield_id,
                         'type': 'subfield'
-                    })
-                    seen_entities.add(subfield_openalex_id)
+                    }
                     
                     # Add parent -> subfield relationship
                     if target_level in ['domain', 'field']:
@@ -159,8 +154,10 @@ def extract_hierarchy(target_node):
                             'relationship_type': 'field_to_subfield'
                         })
                 
-                # Add topic entity (always)
-                entities.append({
+                # Add topic entity (once per topic ID)
+                if topic_id in topics:
+                    continue
+                topics[topic_id] = {
                     'id': topic_openalex_id,
                     'name': topic_name,
                     'original_id': topic_id,
@@ -168,7 +165,7 @@ def extract_hierarchy(target_node):
                     'keywords': keywords,
                     'summary': summary,
                     'link': link
-                })
+                }
                 
                 # Add subfield -> topic relationship
                 relationships.append({
@@ -183,8 +180,30 @@ def extract_hierarchy(target_node):
                 print(f"Error processing line {line_num}: {e}")
                 continue
     
+    if target_level is None:
+        print(f"Error: Node '{target_node}' not found in the data!")
+        return [], []
+    
+    # Flatten level by level: domains, fields, subfields, then topics, each in file order
+    entities = list(chain.from_iterable(level.values() for level in entities_by_type.values()))
+    
     return entities, relationships
 
+def write_json(obj, path):
+    """Write obj as indented UTF-8 JSON, using orjson when available
+
+    The data is written to a temporary file and moved into place, so an
+    interrupted run never leaves a truncated JSON file behind.
+    """
+    tmp_path = path + '.tmp'
+    if ORJSON_AVAILABLE:
+        with open(tmp_path, 'wb') as f:
+            f.write(orjson.dumps(obj, option=orjson.OPT_INDENT_2))
+    else:
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump(obj, f, indent=2, ensure_ascii=False)
+    os.replace(tmp_path, path)
+
 def save_to_files(entities, relationships, node_name):
     """Save entities and relationships to JSON files in data folder"""
     
@@ -192,33 +211,33 @@ def save_to_files(entities, relationships, node_name):
     os.makedirs('data', exist_ok=True)
     
     # Clean node name for filename (replace spaces and special characters)
-    clean_name = node_name.lower().replace(' ', '_').replace('&', 'and').replace(',', '').replace('(', '').replace(')', '')
+    clean_name = node_name.lower().translate(FILENAME_TRANSLATION)
     
     entities_filename = f"data/{clean_name}_entities.json"
     relationships_filename = f"data/{clean_name}_relationships.json"
     
     # Save entities to JSON
-    with open(entities_filename, 'w', encoding='utf-8') as f:
-        json.dump(entities, f, indent=2, ensure_ascii=False)
+    write_json(entities, entities_filename)
     
     # Save relationships to JSON
-    with open(relationships_filename, 'w', encoding='utf-8') as f:
-        json.dump(relationships, f, indent=2, ensure_ascii=False)
+    write_json(relationships, relationships_filename)
     
     return entities_filename, relationships_filename
 
 def generate_summary_stats(entities, relationships):
     """Generate summary statistics"""
     
-    # Count entities by type
-    entity_counts = defaultdict(int)
+    # Count entities by type and keep the first 3 of each type as samples, in one pass
+    entity_counts = Counter()
+    by_type = defaultdict(list)
     for entity in entities:
-        entity_counts[entity['type']] += 1
+        entity_type = entity['type']
+        entity_counts[entity_type] += 1
+        if entity_counts[entity_type] <= 3:
+            by_type[entity_type].append(entity)
     
     # Count relationships by type
-    rel_counts = defaultdict(int)
-    for rel in relationships:
-        rel_counts[rel['relationship_type']] += 1
+    rel_counts = Counter(rel['relationship_type'] for rel in relationships)
     
     print("\n=== SUMMARY STATISTICS ===")
     print("\nEntity Counts:")
@@ -233,14 +252,10 @@ def generate_summary_stats(entities, relationships):
     
     # Show some sample entities for each type
     print("\n=== SAMPLE ENTITIES ===")
-    by_type = defaultdict(list)
-    for entity in entities:
-        by_type[entity['type']].append(entity)
-    
     for entity_type in ['domain', 'field', 'subfield', 'topic']:
         if entity_type in by_type:
             print(f"\nSample {entity_type} entities:")
-            for i, entity in enumerate(by_type[entity_type][:3]):
+            for i, entity in enumerate(by_type[entity_type]):
                 print(f"  {i+1}. {entity['name']} ({entity['id']})")
 
 def main():
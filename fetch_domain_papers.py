@@ -5,12 +5,120 @@ Handles pagination and saves results in JSON files
 """
 
 import json
+import math
 import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+import threading
 import time
 import os
-from typing import Dict, List, Any
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from typing import Dict, Iterator, List, Any, Tuple
 from urllib.parse import urlencode
 
+# Optional faster JSON decoding of API responses, falls back to the standard json module
+try:
+    import orjson
+    ORJSON_AVAILABLE = True
+except ImportError:
+    ORJSON_AVAILABLE = False
+
+# Number of professors fetched concurrently
+MAX_WORKERS = 8
+
+# Result pages fetched concurrently for one query, once page 1 has given the total count
+PAGE_WORKERS = 4
+
+WORKS_URL = "https://api.openalex.org/works"
+PER_PAGE = 200  # Maximum allowed by OpenAlex API
+
+# Work fields copied unchanged into the output; the abstract is converted separately
+KEPT_WORK_FIELDS = ('id', 'doi', 'title', 'publication_date', 'open_access', 'primary_topic')
+
+# Fields requested from /works: what filter_paper_fields/filter_citation_fields keep,
+# plus referenced_works for assigning batched citation results to papers
+WORK_FIELDS = "id,doi,title,publication_date,open_access,primary_topic,abstract_inverted_index,referenced_works"
+
+# Work IDs combined into one OR filter (cites:W1|W2|...) when fetching citations
+CITATION_BATCH_SIZE = 50
+
+# OpenAlex serves at most this many results through page= pagination; larger
+# result sets must be walked with cursor pagination
+MAX_PAGED_RESULTS = 10000
+
+# OpenAlex polite-pool limit, shared by all worker threads
+MAX_REQUESTS_PER_SECOND = 10
+
+# Optional contact address; OpenAlex routes requests that include one to its faster polite pool
+OPENALEX_MAILTO = os.environ.get('OPENALEX_MAILTO')
+
+# One session shared by all threads, so TCP/TLS connections to the API are pooled and reused
+# instead of being set up again for every page
+SESSION = requests.Session()
+SESSION.mount('https://', HTTPAdapter(
+    pool_connections=16,
+    pool_maxsize=MAX_WORKERS * PAGE_WORKERS,
+    max_retries=Retry(
+        total=3,
+        backoff_factor=1,
+        status_forcelist=[429, 500, 502, 503, 504],
+        allowed_methods=["GET"],
+        raise_on_status=False
+    )
+))
+if OPENALEX_MAILTO:
+    SESSION.headers['User-Agent'] = f"openalex-raw (mailto:{OPENALEX_MAILTO})"
+
+# On-disk cache of completed fetches (author papers, per-work citations) so an interrupted
+# run resumes without re-crawling; delete the directory to force a full refetch
+CACHE_DIR = os.path.join('data', '.cache', 'openalex')
+CACHE_TTL_SECONDS = 30 * 24 * 3600
+
+_rate_lock = threading.Lock()
+_next_request_time = 0.0
+
+def wait_for_rate_limit():
+    """
+    Block until the next OpenAlex request may be sent, spacing requests from all threads
+    evenly so that at most MAX_REQUESTS_PER_SECOND are issued per second
+    """
+    global _next_request_time
+    with _rate_lock:
+        now = time.monotonic()
+        wait = _next_request_time - now
+        _next_request_time = max(now, _next_request_time) + 1.0 / MAX_REQUESTS_PER_SECOND
+    if wait > 0:
+        time.sleep(wait)
+
+def cache_path(kind: str, key: str) -> str:
+    """Path of the cache file for an OpenAlex ID (full URL or bare ID) of the given kind"""
+    return os.path.join(CACHE_DIR, kind, key.split('/')[-1] + '.json')
+
+def cache_get(kind: str, key: str):
+    """
+    Return the cached value for key, or None if it is missing, unreadable or older than CACHE_TTL_SECONDS
+    """
+    path = cache_path(kind, key)
+    try:
+        if time.time() - os.path.getmtime(path) > CACHE_TTL_SECONDS:
+            return None
+        if ORJSON_AVAILABLE:
+            with open(path, 'rb') as f:
+                return orjson.loads(f.read())
+        with open(path, 'r', encoding='utf-8') as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return None
+
+def cache_put(kind: str, key: str, value):
+    """Store value for key; written to a temporary file and renamed so readers never see partial data"""
+    path = cache_path(kind, key)
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    tmp_path = f"{path}.{threading.get_ident()}.tmp"
+    with open(tmp_path, 'w', encoding='utf-8') as f:
+        json.dump(value, f, ensure_ascii=False, separators=(',', ':'))
+    os.replace(tmp_path, path)
+
 def load_professor_lists() -> Dict[str, Dict[str, str]]:
     """
     Load professor lists from JSON files
@@ -28,198 +136,273 @@ def load_professor_lists() -> Dict[str, Dict[str, str]]:
     
     return professor_lists
 
-def fetch_papers_for_professor(author_id: str, max_retries: int = 3) -> List[Dict[str, Any]]:
+def fetch_works_page(filter_expr: str, page: int, label: str, max_retries: int = 3, cursor: str = None) -> Dict[str, Any]:
     """
-    Fetch all papers for a specific professor using OpenAlex API
-    Handles pagination and retries
+    Fetch one page of /works results for a filter, with retries
     
     Args:
-        author_id: OpenAlex author ID
+        filter_expr: OpenAlex filter expression (e.g., author.id:A123)
+        page: 1-based page number (used for progress messages only when cursor is given)
+        label: Description used in progress messages
         max_retries: Maximum number of retry attempts
+        cursor: Cursor for cursor pagination ('*' for the first page); page= is used when None
         
     Returns:
-        List of paper dictionaries
+        Decoded response, or None if every attempt failed
     """
-    base_url = "https://api.openalex.org/works"
-    all_papers = []
-    page = 1
-    per_page = 200  # Maximum allowed by OpenAlex API
-    
-    while True:
-        # Prepare query parameters
-        params = {
-            'filter': f'author.id:{author_id}',
-            'per_page': per_page,
-            'page': page
-        }
-        
-        # Build URL with parameters
-        url = f"{base_url}?{urlencode(params)}"
-        
-        # Make request with retry logic
-        for attempt in range(max_retries):
-            try:
-                print(f"  Fetching page {page} (attempt {attempt + 1})...")
-                response = requests.get(url, timeout=30)
-                response.raise_for_status()
-                
-                data = response.json()
-                break
-                
-            except requests.exceptions.RequestException as e:
-                print(f"    Error on attempt {attempt + 1}: {e}")
-                if attempt == max_retries - 1:
-                    print(f"    Failed to fetch page {page} after {max_retries} attempts")
-                    return all_papers
-                time.sleep(2 ** attempt)  # Exponential backoff
-        
-        # Extract papers from response
-        papers = data.get('results', [])
-        if not papers:
-            break
+    params = {
+        'filter': filter_expr,
+        'select': WORK_FIELDS,
+        'per_page': PER_PAGE
+    }
+    if cursor is None:
+        params['page'] = page
+    else:
+        params['cursor'] = cursor
+    
+    # Build URL with parameters
+    url = f"{WORKS_URL}?{urlencode(params)}"
+    
+    # Make request with retry logic
+    for attempt in range(max_retries):
+        try:
+            wait_for_rate_limit()
+            response = SESSION.get(url, timeout=30)
+            response.raise_for_status()
+            # Decode the raw bytes directly; skips requests' charset detection and text decoding
+            if ORJSON_AVAILABLE:
+                return orjson.loads(response.content)
+            return response.json()
             
-        all_papers.extend(papers)
-        
-        # Check if we've reached the end
-        meta = data.get('meta', {})
-        total_count = meta.get('count', 0)
+        except (requests.exceptions.RequestException, ValueError) as e:
+            print(f"        Error fetching {label} page {page} (attempt {attempt + 1}): {e}")
+            if attempt == max_retries - 1:
+                print(f"        Failed to fetch {label} page {page} after {max_retries} attempts")
+                return None
+            time.sleep(2 ** attempt)  # Exponential backoff
+    
+    return None
+
+def work_id_to_int(work_id: str) -> int:
+    """
+    Convert an OpenAlex work ID to its numeric part for compact in-memory keys
+    
+    Args:
+        work_id: Work ID, e.g. "https://openalex.org/W2153066044"
         
-        print(f"    Retrieved {len(papers)} papers (total so far: {len(all_papers)}/{total_count})")
+    Returns:
+        Numeric part of the ID, e.g. 2153066044
+    """
+    return int(work_id.rsplit('/W', 1)[-1])
+
+def fetch_all_works(filter_expr: str, label: str, max_retries: int = 3, failed_pages: List[int] = None) -> List[Dict[str, Any]]:
+    """
+    Fetch every work matching a filter
+    
+    Page 1 is fetched first to learn the total count; the remaining pages are then
+    fetched concurrently (PAGE_WORKERS at a time, under the shared rate limit) and
+    appended in page order. Works already seen on an earlier page are skipped, since
+    offset pages fetched at different times can overlap when the result set shifts.
+    If a page cannot be fetched, the works from the pages before it are returned.
+    
+    Args:
+        filter_expr: OpenAlex filter expression
+        label: Description used in progress messages
+        max_retries: Maximum number of retry attempts per page
+        failed_pages: Optional list that receives the number of a page that could not be fetched,
+            so callers can tell a partial result from a complete one
         
-        # If we've got all papers, break
-        if len(all_papers) >= total_count:
-            break
+    Returns:
+        List of work dictionaries
+    """
+    data = fetch_works_page(filter_expr, 1, label, max_retries)
+    if data is None:
+        if failed_pages is not None:
+            failed_pages.append(1)
+        return []
+    
+    all_works = data.get('results', [])
+    total_count = data.get('meta', {}).get('count', 0)
+    
+    if total_count > 0:
+        print(f"        {label}: page 1, got {len(all_works)} works ({len(all_works)}/{total_count} total)")
+    
+    # Check if we've reached the end
+    if not all_works or len(all_works) >= total_count:
+        return all_works
+    
+    if total_count > MAX_PAGED_RESULTS:
+        return fetch_all_works_by_cursor(filter_expr, label, max_retries, failed_pages)
+    
+    page_count = math.ceil(total_count / PER_PAGE)
+    seen_ids = {work_id_to_int(work['id']) for work in all_works if work.get('id')}
+    with ThreadPoolExecutor(max_workers=PAGE_WORKERS) as executor:
+        pages = executor.map(lambda page: fetch_works_page(filter_expr, page, label, max_retries),
+                             range(2, page_count + 1))
+        for page, data in enumerate(pages, 2):
+            if data is None and failed_pages is not None:
+                failed_pages.append(page)
+            works = data.get('results', []) if data else []
+            if not works:
+                break
             
-        page += 1
-        
-        # Rate limiting - be respectful to the API
-        time.sleep(1)
+            for work in works:
+                if work.get('id'):
+                    key = work_id_to_int(work['id'])
+                    if key in seen_ids:
+                        continue
+                    seen_ids.add(key)
+                all_works.append(work)
+            print(f"        {label}: page {page}, got {len(works)} works ({len(all_works)}/{total_count} total)")
     
-    return all_papers
+    return all_works
 
-def fetch_cited_works(work_id: str, max_retries: int = 3) -> List[Dict[str, Any]]:
+def fetch_all_works_by_cursor(filter_expr: str, label: str, max_retries: int = 3, failed_pages: List[int] = None) -> List[Dict[str, Any]]:
     """
-    Fetch works that cite the given work (cited_by relationship)
+    Fetch every work matching a filter with cursor pagination
+    
+    Used for result sets beyond the page= limit; pages are fetched one after another
+    since each cursor comes from the previous response.
     
     Args:
-        work_id: OpenAlex work ID (e.g., W2153066044)
-        max_retries: Maximum number of retry attempts
+        filter_expr: OpenAlex filter expression
+        label: Description used in progress messages
+        max_retries: Maximum number of retry attempts per page
+        failed_pages: Optional list that receives the number of a page that could not be fetched
         
     Returns:
-        List of works that cite this work
+        List of work dictionaries
     """
-    # Extract work ID from full URL if needed
-    if work_id.startswith('https://openalex.org/'):
-        work_id = work_id.split('/')[-1]
-    
-    base_url = "https://api.openalex.org/works"
     all_works = []
+    cursor = '*'
     page = 1
-    per_page = 200
-    
-    while True:
-        params = {
-            'filter': f'cites:{work_id}',
-            'per_page': per_page,
-            'page': page
-        }
-        
-        url = f"{base_url}?{urlencode(params)}"
-        
-        for attempt in range(max_retries):
-            try:
-                response = requests.get(url, timeout=30)
-                response.raise_for_status()
-                data = response.json()
-                break
-            except requests.exceptions.RequestException as e:
-                print(f"        Error fetching cited works page {page} (attempt {attempt + 1}): {e}")
-                if attempt == max_retries - 1:
-                    return all_works
-                time.sleep(1)
+    
+    while cursor:
+        data = fetch_works_page(filter_expr, page, label, max_retries, cursor=cursor)
+        if data is None:
+            if failed_pages is not None:
+                failed_pages.append(page)
+            break
         
         works = data.get('results', [])
         if not works:
             break
-            
+        
         all_works.extend(works)
         
-        # Check if we've reached the end
         meta = data.get('meta', {})
-        total_count = meta.get('count', 0)
-        
-        if total_count > 0:
-            print(f"        Cited works: page {page}, got {len(works)} works ({len(all_works)}/{total_count} total)")
+        print(f"        {label}: page {page}, got {len(works)} works ({len(all_works)}/{meta.get('count', 0)} total)")
         
-        if len(all_works) >= total_count:
-            break
-            
+        cursor = meta.get('next_cursor')
         page += 1
-        time.sleep(0.5)  # Rate limiting
     
     return all_works
 
-def fetch_citing_works(work_id: str, max_retries: int = 3) -> List[Dict[str, Any]]:
+def fetch_papers_for_professor(author_id: str, max_retries: int = 3) -> List[Dict[str, Any]]:
     """
-    Fetch works cited by the given work (cited_by relationship)
+    Fetch all papers for a specific professor using OpenAlex API
+    Handles pagination and retries
     
     Args:
-        work_id: OpenAlex work ID (e.g., W2153066044)
+        author_id: OpenAlex author ID
         max_retries: Maximum number of retry attempts
         
     Returns:
-        List of works cited by this work
+        List of paper dictionaries
     """
-    # Extract work ID from full URL if needed
-    if work_id.startswith('https://openalex.org/'):
-        work_id = work_id.split('/')[-1]
+    cached = cache_get('authors', author_id)
+    if cached is not None:
+        print(f"    Loaded {len(cached)} papers for {author_id} from cache")
+        return cached
     
-    base_url = "https://api.openalex.org/works"
-    all_works = []
-    page = 1
-    per_page = 200
-    
-    while True:
-        params = {
-            'filter': f'cited_by:{work_id}',
-            'per_page': per_page,
-            'page': page
-        }
-        
-        url = f"{base_url}?{urlencode(params)}"
-        
-        for attempt in range(max_retries):
-            try:
-                response = requests.get(url, timeout=30)
-                response.raise_for_status()
-                data = response.json()
-                break
-            except requests.exceptions.RequestException as e:
-                print(f"        Error fetching citing works page {page} (attempt {attempt + 1}): {e}")
-                if attempt == max_retries - 1:
-                    return all_works
-                time.sleep(1)
-        
-        works = data.get('results', [])
-        if not works:
-            break
-            
-        all_works.extend(works)
-        
-        # Check if we've reached the end
-        meta = data.get('meta', {})
-        total_count = meta.get('count', 0)
-        
-        if total_count > 0:
-            print(f"        Citing works: page {page}, got {len(works)} works ({len(all_works)}/{total_count} total)")
-        
-        if len(all_works) >= total_count:
-            break
-            
-        page += 1
-        time.sleep(0.5)  # Rate limiting
+    failed_pages = []
+    papers = fetch_all_works(f'author.id:{author_id}', 'Papers', max_retries, failed_pages)
     
-    return all_works
+    # Only complete results are cached, so a failed page is retried on the next run
+    if not failed_pages:
+        cache_put('authors', author_id, papers)
+    
+    return papers
+
+def fetch_citations_batched(papers: List[Dict[str, Any]], max_retries: int = 3) -> Tuple[Dict[str, List[Dict[str, Any]]], Dict[str, List[Dict[str, Any]]]]:
+    """
+    Fetch citing and cited works for many papers with OR-filter queries
+    
+    Papers are grouped into batches of CITATION_BATCH_SIZE and each batch costs one
+    cites: and one cited_by: query instead of two queries per paper; papers with an
+    empty referenced_works are left out of the cited_by: batches. Results are
+    assigned back to individual papers through referenced_works: a work cites a paper
+    when the paper's ID is in the work's referenced_works, and a work is cited by a
+    paper when its ID is in the paper's referenced_works.
+    
+    Args:
+        papers: List of paper dictionaries from OpenAlex API
+        max_retries: Maximum number of retry attempts per page
+        
+    Returns:
+        Tuple (citing_works, cited_works) of dicts keyed by paper ID: citing_works
+        holds the works each paper cites (cited_by:<id>), cited_works the works
+        that cite each paper (cites:<id>)
+    """
+    papers = [paper for paper in papers if 'id' in paper]
+    citing_works = {}
+    cited_works = {}
+    
+    # Reuse citations cached by earlier runs; only the remaining papers are queried
+    for paper in papers:
+        cached = cache_get('cited_by', paper['id'])
+        if cached is not None:
+            citing_works[paper['id']] = cached
+        cached = cache_get('cites', paper['id'])
+        if cached is not None:
+            cited_works[paper['id']] = cached
+    
+    # referenced_works in the paper payload already says which works a paper cites, so
+    # papers without references need no cited_by: query at all
+    referencing = []
+    for paper in papers:
+        if paper['id'] not in citing_works:
+            if paper.get('referenced_works'):
+                referencing.append(paper)
+            else:
+                citing_works[paper['id']] = []
+    
+    for start in range(0, len(referencing), CITATION_BATCH_SIZE):
+        batch = referencing[start:start + CITATION_BATCH_SIZE]
+        batch_filter = '|'.join(paper['id'].split('/')[-1] for paper in batch)
+        
+        # Works cited by any paper of the batch, assigned via each paper's referenced_works
+        referencing_papers = {}
+        for paper in batch:
+            citing_works[paper['id']] = []
+            for ref in paper['referenced_works']:
+                referencing_papers.setdefault(ref, []).append(paper['id'])
+        failed_pages = []
+        for work in fetch_all_works(f'cited_by:{batch_filter}', 'Citing works', max_retries, failed_pages):
+            for paper_id in referencing_papers.get(work.get('id'), ()):
+                citing_works[paper_id].append(work)
+        if not failed_pages:
+            for paper in batch:
+                cache_put('cited_by', paper['id'], citing_works[paper['id']])
+    
+    uncached = [paper for paper in papers if paper['id'] not in cited_works]
+    for start in range(0, len(uncached), CITATION_BATCH_SIZE):
+        batch = uncached[start:start + CITATION_BATCH_SIZE]
+        batch_filter = '|'.join(paper['id'].split('/')[-1] for paper in batch)
+        
+        # Works citing any paper of the batch, assigned via each work's referenced_works
+        batch_cited_works = {paper['id']: [] for paper in batch}
+        failed_pages = []
+        for work in fetch_all_works(f'cites:{batch_filter}', 'Cited works', max_retries, failed_pages):
+            for ref in work.get('referenced_works') or []:
+                if ref in batch_cited_works:
+                    batch_cited_works[ref].append(work)
+        cited_works.update(batch_cited_works)
+        if not failed_pages:
+            for paper_id, works in batch_cited_works.items():
+                cache_put('cites', paper_id, works)
+    
+    return citing_works, cited_works
 
 def convert_inverted_index_to_abstract(inverted_index: Dict[str, List[int]]) -> str:
     """
@@ -234,23 +417,30 @@ def convert_inverted_index_to_abstract(inverted_index: Dict[str, List[int]]) ->
     if not inverted_index:
         return ""
     
-    # Create a list to hold words in their correct positions
-    word_positions = []
-    
-    # Extract all word-position pairs
-    for word, positions in inverted_index.items():
-        for position in positions:
-            word_positions.append((position, word))
-    
-    # Sort by position
-    word_positions.sort(key=lambda x: x[0])
-    
-    # Extract just the words in order
-    words = [word for position, word in word_positions]
+    # Place each word directly at its position in a list with one slot per position:
+    # O(n), no (position, word) tuples and no sorting
+    words = [None] * sum(len(positions) for positions in inverted_index.values())
+    try:
+        for word, positions in inverted_index.items():
+            for position in positions:
+                words[position] = word
+    except IndexError:
+        # Positions beyond the word count (gaps in the index); fall back to sorting
+        return _join_words_by_sorted_position(inverted_index)
+    
+    # An empty slot means a gap or a shared position; fall back to sorting for those
+    if None in words:
+        return _join_words_by_sorted_position(inverted_index)
     
     # Join words with spaces
     return ' '.join(words)
 
+def _join_words_by_sorted_position(inverted_index: Dict[str, List[int]]) -> str:
+    """Join words ordered by a stable sort of their positions"""
+    word_positions = [(position, word) for word, positions in inverted_index.items() for position in positions]
+    word_positions.sort(key=lambda x: x[0])
+    return ' '.join(word for position, word in word_positions)
+
 def filter_paper_fields(papers: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
     """
     Filter papers to keep only the specified fields
@@ -261,62 +451,86 @@ def filter_paper_fields(papers: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
     Returns:
         List of filtered paper dictionaries with only specified fields
     """
-    filtered_papers = []
+    return list(iter_filtered_papers(papers))
+
+def iter_filtered_papers(papers: List[Dict[str, Any]]) -> Iterator[Dict[str, Any]]:
+    """
+    Yield filtered papers one at a time
+    
+    Citations are fetched for CITATION_BATCH_SIZE papers at a time, so only one batch of
+    citation results is held in memory while the filtered papers are consumed.
+    
+    Args:
+        papers: List of paper dictionaries from OpenAlex API
+        
+    Yields:
+        Filtered paper dictionaries with only specified fields
+    """
     total_papers = len(papers)
     
-    for idx, paper in enumerate(papers, 1):
-        print(f"    Processing paper {idx}/{total_papers}: {paper.get('title', 'Untitled')[:50]}...")
+    for start in range(0, total_papers, CITATION_BATCH_SIZE):
+        batch = papers[start:start + CITATION_BATCH_SIZE]
         
-        filtered_paper = {}
+        # Fetch citations for the whole batch with a few OR-filter queries
+        print(f"    Fetching citations for papers {start + 1}-{start + len(batch)}/{total_papers}...")
+        all_citing_works, all_cited_works = fetch_citations_batched(batch)
         
-        # Keep only the specified fields
-        if 'id' in paper:
-            filtered_paper['id'] = paper['id']
-        if 'doi' in paper:
-            filtered_paper['doi'] = paper['doi']
-        if 'title' in paper:
-            filtered_paper['title'] = paper['title']
-        if 'publication_date' in paper:
-            filtered_paper['publication_date'] = paper['publication_date']
-        if 'open_access' in paper:
-            filtered_paper['open_access'] = paper['open_access']
-        if 'primary_topic' in paper:
-            filtered_paper['primary_topic'] = paper['primary_topic']
-        if 'abstract_inverted_index' in paper:
-            filtered_paper['abstract'] = convert_inverted_index_to_abstract(paper['abstract_inverted_index'])
+        # Papers of one author often share citing/cited works; convert each abstract once per batch
+        abstracts = {}
+        for idx, paper in enumerate(batch, start + 1):
+            yield filter_paper(paper, idx, total_papers, all_citing_works, all_cited_works, abstracts)
+
+def filter_paper(paper: Dict[str, Any], idx: int, total_papers: int,
+                 all_citing_works: Dict[str, List[Dict[str, Any]]],
+                 all_cited_works: Dict[str, List[Dict[str, Any]]],
+                 abstracts: Dict[str, str] = None) -> Dict[str, Any]:
+    """
+    Filter one paper and attach its already fetched citations
+    
+    Args:
+        paper: Paper dictionary from OpenAlex API
+        idx: Position of the paper (for progress output)
+        total_papers: Number of papers being processed
+        all_citing_works: Citing works by paper ID, from fetch_citations_batched
+        all_cited_works: Cited works by paper ID, from fetch_citations_batched
+        abstracts: Optional cache of converted citation abstracts by work ID
         
-        # Get citation information
-        if 'id' in paper:
-            work_id = paper['id']
-            print(f"      [{idx}/{total_papers}] Fetching citations for: {work_id}")
-            
-            # Get works that cite this paper (cited_by)
-            print(f"      [{idx}/{total_papers}] Getting citing works...")
-            citing_works = fetch_citing_works(work_id)
-            filtered_paper['cited_by_works'] = filter_citation_fields(citing_works)
-            print(f"      [{idx}/{total_papers}] Found {len(citing_works)} citing works")
-            
-            # Get works cited by this paper (cites)
-            print(f"      [{idx}/{total_papers}] Getting cited works...")
-            cited_works = fetch_cited_works(work_id)
-            filtered_paper['cited_works'] = filter_citation_fields(cited_works)
-            print(f"      [{idx}/{total_papers}] Found {len(cited_works)} cited works")
-            
-            filtered_paper['cited_by_count'] = len(citing_works)
-            filtered_paper['cited_count'] = len(cited_works)
-            
-            print(f"      [{idx}/{total_papers}] Citation processing complete (cited_by: {len(citing_works)}, cites: {len(cited_works)})")
+    Returns:
+        Filtered paper dictionary
+    """
+    print(f"    Processing paper {idx}/{total_papers}: {paper.get('title', 'Untitled')[:50]}...")
+    
+    # Keep only the specified fields
+    filtered_paper = {key: paper[key] for key in KEPT_WORK_FIELDS if key in paper}
+    if 'abstract_inverted_index' in paper:
+        filtered_paper['abstract'] = convert_inverted_index_to_abstract(paper['abstract_inverted_index'])
+    
+    # Get citation information
+    if 'id' in paper:
+        work_id = paper['id']
+        
+        # Get works that cite this paper (cited_by)
+        citing_works = all_citing_works[work_id]
+        filtered_paper['cited_by_works'] = filter_citation_fields(citing_works, abstracts)
+        
+        # Get works cited by this paper (cites)
+        cited_works = all_cited_works[work_id]
+        filtered_paper['cited_works'] = filter_citation_fields(cited_works, abstracts)
         
-        filtered_papers.append(filtered_paper)
+        filtered_paper['cited_by_count'] = len(citing_works)
+        filtered_paper['cited_count'] = len(cited_works)
+        
+        print(f"      [{idx}/{total_papers}] Citation processing complete (cited_by: {len(citing_works)}, cites: {len(cited_works)})")
     
-    return filtered_papers
+    return filtered_paper
 
-def filter_citation_fields(works: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+def filter_citation_fields(works: List[Dict[str, Any]], abstracts: Dict[str, str] = None) -> List[Dict[str, Any]]:
     """
     Filter citation works to keep only specified fields
     
     Args:
         works: List of work dictionaries from OpenAlex API
+        abstracts: Optional dict used to reuse abstracts already converted for the same work ID
         
     Returns:
         List of filtered work dictionaries
@@ -324,22 +538,16 @@ def filter_citation_fields(works: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
     filtered_works = []
     
     for work in works:
-        filtered_work = {}
-        
-        if 'id' in work:
-            filtered_work['id'] = work['id']
-        if 'doi' in work:
-            filtered_work['doi'] = work['doi']
-        if 'title' in work:
-            filtered_work['title'] = work['title']
-        if 'publication_date' in work:
-            filtered_work['publication_date'] = work['publication_date']
-        if 'open_access' in work:
-            filtered_work['open_access'] = work['open_access']
-        if 'primary_topic' in work:
-            filtered_work['primary_topic'] = work['primary_topic']
+        filtered_work = {key: work[key] for key in KEPT_WORK_FIELDS if key in work}
         if 'abstract_inverted_index' in work:
-            filtered_work['abstract'] = convert_inverted_index_to_abstract(work['abstract_inverted_index'])
+            work_id = work.get('id')
+            if abstracts is None or work_id is None:
+                filtered_work['abstract'] = convert_inverted_index_to_abstract(work['abstract_inverted_index'])
+            else:
+                abstract = abstracts.get(work_id)
+                if abstract is None:
+                    abstract = abstracts[work_id] = convert_inverted_index_to_abstract(work['abstract_inverted_index'])
+                filtered_work['abstract'] = abstract
         
         filtered_works.append(filtered_work)
     
@@ -365,26 +573,58 @@ def save_professor_papers(professor_name: str, author_id: str, papers: List[Dict
     filename = f"{safe_name}_{author_id}_detail.json"
     filepath = os.path.join(output_dir, filename)
     
-    # Filter papers to keep only specified fields
-    filtered_papers = filter_paper_fields(papers)
-    
-    # Prepare data structure
-    output_data = {
-        "professor_info": {
-            "name": professor_name,
-            "author_id": author_id,
-            "department": department,
-            "total_papers": len(papers),
-            "fetch_date": time.strftime("%Y-%m-%d %H:%M:%S")
-        },
-        "papers": filtered_papers
+    professor_info = {
+        "name": professor_name,
+        "author_id": author_id,
+        "department": department,
+        "total_papers": len(papers),
+        "fetch_date": time.strftime("%Y-%m-%d %H:%M:%S")
     }
     
-    # Save to file
-    with open(filepath, 'w', encoding='utf-8') as f:
-        json.dump(output_data, f, indent=2, ensure_ascii=False)
+    # Stream papers to disk as they are filtered instead of building the whole document
+    # in memory; the output is identical to json.dump(..., indent=2, ensure_ascii=False).
+    # Write to a temporary file first so an interrupted run never leaves truncated JSON.
+    tmp_path = filepath + '.tmp'
+    saved_count = 0
+    with open(tmp_path, 'w', encoding='utf-8') as f:
+        f.write('{\n  "professor_info": ')
+        f.write(json.dumps(professor_info, indent=2, ensure_ascii=False).replace('\n', '\n  '))
+        f.write(',\n  "papers": [')
+        for filtered_paper in iter_filtered_papers(papers):
+            f.write(',\n    ' if saved_count else '\n    ')
+            f.write(json.dumps(filtered_paper, indent=2, ensure_ascii=False).replace('\n', '\n    '))
+            saved_count += 1
+        f.write('\n  ]\n}' if saved_count else ']\n}')
+    os.replace(tmp_path, filepath)
+    
+    print(f"    Saved {len(papers)} papers to {filepath} (filtered to {saved_count} fields per paper)")
+
+def process_professor(professor_name: str, author_id: str, department: str, index: int, total: int) -> int:
+    """
+    Fetch and save all papers for one professor
+    
+    Args:
+        professor_name: Name of the professor
+        author_id: OpenAlex author ID
+        department: Department name for organizing files
+        index: Position of this professor in the overall run (for progress output)
+        total: Total number of professors in the run
+        
+    Returns:
+        Number of papers saved
+    """
+    print(f"\n[{index}/{total}] Processing {professor_name} ({author_id})...")
+    
+    # Fetch all papers for this professor
+    print(f"    Step 1/2: Fetching papers for {professor_name}...")
+    papers = fetch_papers_for_professor(author_id)
+    print(f"    Found {len(papers)} papers for {professor_name}")
     
-    print(f"    Saved {len(papers)} papers to {filepath} (filtered to {len(filtered_papers)} fields per paper)")
+    # Save papers to file
+    print(f"    Step 2/2: Processing citations and saving data...")
+    save_professor_papers(professor_name, author_id, papers, department)
+    
+    return len(papers)
 
 def main():
     """
@@ -398,33 +638,29 @@ def main():
     total_professors = sum(len(profs) for profs in professor_lists.values())
     processed_count = 0
     
-    # Process each department
-    for department, professors in professor_lists.items():
-        print(f"\nProcessing {department} department ({len(professors)} professors)...")
+    # Professors are fetched concurrently; the shared rate limiter keeps the
+    # overall request rate within the OpenAlex polite-pool limit
+    with ThreadPoolExecutor(max_workers=MAX_WORKERS) as executor:
+        future_to_professor = {}
         
-        # Process each professor in the department
-        for professor_name, author_id in professors.items():
-            processed_count += 1
-            print(f"\n[{processed_count}/{total_professors}] Processing {professor_name} ({author_id})...")
+        # Process each department
+        for department, professors in professor_lists.items():
+            print(f"\nProcessing {department} department ({len(professors)} professors)...")
             
+            # Process each professor in the department
+            for professor_name, author_id in professors.items():
+                processed_count += 1
+                future = executor.submit(process_professor, professor_name, author_id, department,
+                                         processed_count, total_professors)
+                future_to_professor[future] = professor_name
+        
+        for future in as_completed(future_to_professor):
+            professor_name = future_to_professor[future]
             try:
-                # Fetch all papers for this professor
-                print(f"    Step 1/2: Fetching papers for {professor_name}...")
-                papers = fetch_papers_for_professor(author_id)
-                print(f"    Found {len(papers)} papers for {professor_name}")
-                
-                # Save papers to file
-                print(f"    Step 2/2: Processing citations and saving data...")
-                save_professor_papers(professor_name, author_id, papers, department)
-                
-                print(f"    ✓ Successfully processed {professor_name}: {len(papers)} papers")
-                
+                paper_count = future.result()
+                print(f"    ✓ Successfully processed {professor_name}: {paper_count} papers")
             except Exception as e:
                 print(f"    ✗ Error processing {professor_name}: {e}")
-                continue
-            
-            # Rate limiting between professors
-            time.sleep(2)
     
     print(f"\nCompleted! Processed {processed_count} professors.")
     print("Check the 'output' directory for results.")
@@ -4,12 +4,140 @@ Script to fetch papers for topics from computer_science_entities.json using Open
 Handles pagination and saves results in JSON files
 """
 
+import argparse
+import gzip
 import json
+import logging
 import requests
+from requests.adapters import HTTPAdapter
+import threading
 import time
 import os
-from typing import Dict, List, Any
-from urllib.parse import urlencode
+from collections import OrderedDict, deque
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from typing import Dict, Iterator, List, Any, Tuple
+
+logger = logging.getLogger(__name__)
+
+# Optional faster JSON parsing and serialization, falls back to the standard json module
+try:
+    import orjson
+    ORJSON_AVAILABLE = True
+except ImportError:
+    ORJSON_AVAILABLE = False
+
+# Work fields copied unchanged into the output; the abstract is converted separately
+KEPT_WORK_FIELDS = ('id', 'doi', 'title', 'publication_date', 'open_access', 'primary_topic')
+
+# Fields requested from /works: what filter_paper_fields/filter_citation_fields keep, plus
+# referenced_works and cited_by_count for batching citation queries and assigning their results
+WORK_FIELDS = "id,doi,title,publication_date,open_access,primary_topic,abstract_inverted_index,referenced_works,cited_by_count"
+
+# Fields requested for a paper's references (cited_by: queries): their results are assigned
+# through the paper's own referenced_works, so the works' reference lists are not needed
+REFERENCE_FIELDS = "id,doi,title,publication_date,open_access,primary_topic,abstract_inverted_index"
+
+WORKS_URL = "https://api.openalex.org/works"
+
+# Prefix of OpenAlex entity IDs as they appear in API payloads and the entities file
+OPENALEX_ID_PREFIX = "https://openalex.org/"
+PER_PAGE = 200  # Maximum allowed by OpenAlex API
+
+# Work IDs combined into one OR filter (cites:W1|W2|...) when fetching citations
+CITATION_BATCH_SIZE = 50
+
+# Number of topics fetched concurrently
+TOPIC_WORKERS = 4
+
+# Citation queries run concurrently
+CITATION_WORKERS = 8
+
+# Batches of papers whose citations are fetched ahead of the paper being written; bounds
+# how many citation results are held in memory while the output is streamed
+CITATION_PREFETCH_BATCHES = 4
+
+# Filtered citation records kept for reuse across papers and topics (least recently used
+# records are dropped first); popular works recur in many citation lists. Sized to a few
+# citation batches so the cache stays small next to the streamed output
+FILTERED_WORK_CACHE_SIZE = 10000
+
+# OpenAlex polite-pool limit, shared by all worker threads
+MAX_REQUESTS_PER_SECOND = 10
+
+# Optional contact address; OpenAlex routes requests that include one to its faster polite pool
+OPENALEX_MAILTO = os.environ.get('OPENALEX_MAILTO')
+
+# One session for all requests, so the TCP/TLS connection to the API is kept alive and
+# reused across pages instead of being set up again for every call. The adapter does not
+# retry; the fetch functions run their own retry/backoff loops. Responses are compressed:
+# requests sends Accept-Encoding "gzip, deflate", plus "br" when brotli is installed.
+SESSION = requests.Session()
+SESSION.mount('https://', HTTPAdapter(pool_connections=32, pool_maxsize=32, max_retries=0))
+if OPENALEX_MAILTO:
+    SESSION.headers['User-Agent'] = f"openalex-raw (mailto:{OPENALEX_MAILTO})"
+
+# On-disk cache of completed fetches (topic papers, per-work citations) so an interrupted
+# run resumes without re-crawling; delete the directory to force a full refetch
+CACHE_DIR = os.path.join('data', '.cache', 'openalex_topics')
+CACHE_TTL_SECONDS = 30 * 24 * 3600
+
+_filtered_works = OrderedDict()
+_filtered_works_lock = threading.Lock()
+
+_rate_lock = threading.Lock()
+_next_request_time = 0.0
+
+def wait_for_rate_limit():
+    """
+    Block until the next OpenAlex request may be sent, spacing requests from all threads
+    evenly so that at most MAX_REQUESTS_PER_SECOND are issued per second
+    """
+    global _next_request_time
+    with _rate_lock:
+        now = time.monotonic()
+        wait = _next_request_time - now
+        _next_request_time = max(now, _next_request_time) + 1.0 / MAX_REQUESTS_PER_SECOND
+    if wait > 0:
+        time.sleep(wait)
+
+def decode_response(response: requests.Response) -> Dict[str, Any]:
+    """Decode a JSON response body, using orjson on the raw bytes when available"""
+    if ORJSON_AVAILABLE:
+        return orjson.loads(response.content)
+    return response.json()
+
+def bare_id(openalex_id: str) -> str:
+    """Strip the https://openalex.org/ prefix from an OpenAlex ID (e.g. W2153066044); bare IDs are returned unchanged"""
+    return openalex_id.removeprefix(OPENALEX_ID_PREFIX)
+
+def cache_path(kind: str, key: str) -> str:
+    """Path of the cache file for an OpenAlex ID (full URL or bare ID) of the given kind"""
+    return os.path.join(CACHE_DIR, kind, bare_id(key) + '.json')
+
+def cache_get(kind: str, key: str):
+    """
+    Return the cached value for key, or None if it is missing, unreadable or older than CACHE_TTL_SECONDS
+    """
+    path = cache_path(kind, key)
+    try:
+        if time.time() - os.path.getmtime(path) > CACHE_TTL_SECONDS:
+            return None
+        if ORJSON_AVAILABLE:
+            with open(path, 'rb') as f:
+                return orjson.loads(f.read())
+        with open(path, 'r', encoding='utf-8') as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return None
+
+def cache_put(kind: str, key: str, value):
+    """Store value for key; written to a temporary file and renamed so readers never see partial data"""
+    path = cache_path(kind, key)
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    tmp_path = f"{path}.{threading.get_ident()}.tmp"
+    with open(tmp_path, 'w', encoding='utf-8') as f:
+        json.dump(value, f, ensure_ascii=False, separators=(',', ':'))
+    os.replace(tmp_path, path)
 
 def load_topics() -> List[Dict[str, Any]]:
     """
@@ -18,8 +146,12 @@ def load_topics() -> List[Dict[str, Any]]:
     """
     topics = []
     
-    with open('data/computer_science_entities.json', 'r', encoding='utf-8') as f:
-        entities = json.load(f)
+    if ORJSON_AVAILABLE:
+        with open('data/computer_science_entities.json', 'rb') as f:
+            entities = orjson.loads(f.read())
+    else:
+        with open('data/computer_science_entities.json', 'r', encoding='utf-8') as f:
+            entities = json.load(f)
     
     # Filter for topics only
     for entity in entities:
@@ -42,42 +174,42 @@ def fetch_papers_for_topic(topic_id: str, max_retries: int = 3, max_papers: int
         List of paper dictionaries
     """
     # Extract topic ID from full URL if needed
-    if topic_id.startswith('https://openalex.org/'):
-        topic_id = topic_id.split('/')[-1]
+    topic_id = bare_id(topic_id)
+    
+    cache_key = f"{topic_id}_{max_papers}"
+    cached = cache_get('topics', cache_key)
+    if cached is not None:
+        logger.debug("    Loaded %d papers for %s from cache", len(cached), topic_id)
+        return cached
     
-    base_url = "https://api.openalex.org/works"
     all_papers = []
-    cursor = None
+    cursor = '*'  # Start of cursor pagination; OpenAlex only returns next_cursor when one is sent
     per_page = min(200, max_papers)  # Maximum allowed by OpenAlex API
     
     while len(all_papers) < max_papers:
         # Prepare query parameters
         params = {
             'filter': f'topics.id:{topic_id}',
-            'per_page': per_page
+            'select': WORK_FIELDS,
+            'per_page': per_page,
+            'cursor': cursor
         }
         
-        # Add cursor for pagination if we have one
-        if cursor:
-            params['cursor'] = cursor
-        
-        # Build URL with parameters
-        url = f"{base_url}?{urlencode(params)}"
-        
         # Make request with retry logic
         for attempt in range(max_retries):
             try:
-                print(f"  Fetching papers (attempt {attempt + 1})...")
-                response = requests.get(url, timeout=30)
+                logger.debug("  Fetching papers (attempt %d)...", attempt + 1)
+                wait_for_rate_limit()
+                response = SESSION.get(WORKS_URL, params=params, timeout=30)
                 response.raise_for_status()
                 
-                data = response.json()
+                data = decode_response(response)
                 break
                 
-            except requests.exceptions.RequestException as e:
-                print(f"    Error on attempt {attempt + 1}: {e}")
+            except (requests.exceptions.RequestException, ValueError) as e:
+                logger.warning("    Error on attempt %d: %s", attempt + 1, e)
                 if attempt == max_retries - 1:
-                    print(f"    Failed to fetch papers after {max_retries} attempts")
+                    logger.error("    Failed to fetch papers after %d attempts", max_retries)
                     return all_papers
                 time.sleep(2 ** attempt)  # Exponential backoff
         
@@ -96,62 +228,60 @@ def fetch_papers_for_topic(topic_id: str, max_retries: int = 3, max_papers: int
         total_count = meta.get('count', 0)
         next_cursor = meta.get('next_cursor')
         
-        print(f"    Retrieved {len(papers_to_add)} papers (total so far: {len(all_papers)}/{min(max_papers, total_count)})")
+        logger.debug("    Retrieved %d papers (total so far: %d/%d)", len(papers_to_add), len(all_papers), min(max_papers, total_count))
         
         # If no next cursor or we've reached max_papers, break
         if not next_cursor or len(all_papers) >= max_papers:
             break
             
         cursor = next_cursor
-        
-        # Rate limiting - be respectful to the API
-        time.sleep(1)
+    
+    # Only complete results are cached (a failed page returns above), so it is retried on the next run
+    cache_put('topics', cache_key, all_papers)
     
     return all_papers
 
-def fetch_cited_works(work_id: str, max_retries: int = 3, max_works: int = 1000) -> List[Dict[str, Any]]:
+def fetch_all_works(filter_expr: str, label: str, max_retries: int = 3, max_works: int = None,
+                    select: str = WORK_FIELDS, failed_pages: List[int] = None) -> List[Dict[str, Any]]:
     """
-    Fetch works that cite the given work (cited_by relationship)
-    Uses cursor pagination to handle large result sets
+    Fetch works matching a filter with cursor pagination
     
     Args:
-        work_id: OpenAlex work ID (e.g., W2153066044)
-        max_retries: Maximum number of retry attempts
-        max_works: Maximum number of works to fetch (default 1000 to limit API calls)
+        filter_expr: OpenAlex filter expression (e.g., cites:W2153066044)
+        label: Description used in progress messages
+        max_retries: Maximum number of retry attempts per page
+        max_works: Maximum number of works to fetch (None for all)
+        select: Comma-separated work fields to request
+        failed_pages: Optional list that receives the number of a page that could not be fetched,
+            so callers can tell a partial result from a complete one
         
     Returns:
-        List of works that cite this work
+        List of work dictionaries; the works fetched so far if a page keeps failing
     """
-    # Extract work ID from full URL if needed
-    if work_id.startswith('https://openalex.org/'):
-        work_id = work_id.split('/')[-1]
-    
-    base_url = "https://api.openalex.org/works"
     all_works = []
-    cursor = None
-    per_page = 200
+    cursor = '*'
+    page = 1
     
-    while len(all_works) < max_works:
+    while max_works is None or len(all_works) < max_works:
         params = {
-            'filter': f'cites:{work_id}',
-            'per_page': per_page
+            'filter': filter_expr,
+            'select': select,
+            'per_page': PER_PAGE,
+            'cursor': cursor
         }
         
-        # Add cursor for pagination if we have one
-        if cursor:
-            params['cursor'] = cursor
-        
-        url = f"{base_url}?{urlencode(params)}"
-        
         for attempt in range(max_retries):
             try:
-                response = requests.get(url, timeout=30)
+                wait_for_rate_limit()
+                response = SESSION.get(WORKS_URL, params=params, timeout=30)
                 response.raise_for_status()
-                data = response.json()
+                data = decode_response(response)
                 break
-            except requests.exceptions.RequestException as e:
-                print(f"        Error fetching cited works (attempt {attempt + 1}): {e}")
+            except (requests.exceptions.RequestException, ValueError) as e:
+                logger.warning("        Error fetching %s (attempt %d): %s", label.lower(), attempt + 1, e)
                 if attempt == max_retries - 1:
+                    if failed_pages is not None:
+                        failed_pages.append(page)
                     return all_works
                 time.sleep(1)
         
@@ -160,27 +290,44 @@ def fetch_cited_works(work_id: str, max_retries: int = 3, max_works: int = 1000)
             break
         
         # Limit to max_works
-        remaining = max_works - len(all_works)
-        works_to_add = works[:remaining]
-        all_works.extend(works_to_add)
+        if max_works is not None:
+            works = works[:max_works - len(all_works)]
+        all_works.extend(works)
         
         meta = data.get('meta', {})
         total_count = meta.get('count', 0)
         next_cursor = meta.get('next_cursor')
         
         if total_count > 0:
-            print(f"        Cited works: got {len(works_to_add)} works ({len(all_works)}/{min(max_works, total_count)} total)")
+            expected = total_count if max_works is None else min(max_works, total_count)
+            logger.debug("        %s: got %d works (%d/%d total)", label, len(works), len(all_works), expected)
         
-        # If no next cursor or we've reached max_works, stop
-        if not next_cursor or len(all_works) >= max_works:
+        # If no next cursor, we've reached the end
+        if not next_cursor:
             break
-            
+        
         cursor = next_cursor
-        time.sleep(0.5)  # Rate limiting
+        page += 1
     
     return all_works
 
-def fetch_citing_works(work_id: str, max_retries: int = 3, max_works: int = 1000) -> List[Dict[str, Any]]:
+def fetch_cited_works(work_id: str, max_retries: int = 3, max_works: int = 1000, failed_pages: List[int] = None) -> List[Dict[str, Any]]:
+    """
+    Fetch works that cite the given work (cited_by relationship)
+    Uses cursor pagination to handle large result sets
+    
+    Args:
+        work_id: OpenAlex work ID (e.g., W2153066044)
+        max_retries: Maximum number of retry attempts
+        max_works: Maximum number of works to fetch (default 1000 to limit API calls)
+        failed_pages: Optional list that receives the number of a page that could not be fetched
+        
+    Returns:
+        List of works that cite this work
+    """
+    return fetch_all_works(f'cites:{bare_id(work_id)}', 'Cited works', max_retries, max_works, failed_pages=failed_pages)
+
+def fetch_citing_works(work_id: str, max_retries: int = 3, max_works: int = 1000, failed_pages: List[int] = None) -> List[Dict[str, Any]]:
     """
     Fetch works cited by the given work (cited_by relationship)
     Uses cursor pagination to handle large result sets
@@ -189,67 +336,118 @@ def fetch_citing_works(work_id: str, max_retries: int = 3, max_works: int = 1000
         work_id: OpenAlex work ID (e.g., W2153066044)
         max_retries: Maximum number of retry attempts
         max_works: Maximum number of works to fetch (default 1000 to limit API calls)
+        failed_pages: Optional list that receives the number of a page that could not be fetched
         
     Returns:
         List of works cited by this work
     """
-    # Extract work ID from full URL if needed
-    if work_id.startswith('https://openalex.org/'):
-        work_id = work_id.split('/')[-1]
-    
-    base_url = "https://api.openalex.org/works"
-    all_works = []
-    cursor = None
-    per_page = 200
+    return fetch_all_works(f'cited_by:{bare_id(work_id)}', 'Citing works', max_retries, max_works, REFERENCE_FIELDS, failed_pages)
+
+def fetch_citations_batched(papers: List[Dict[str, Any]], max_retries: int = 3, max_works: int = 1000) -> Tuple[Dict[str, List[Dict[str, Any]]], Dict[str, List[Dict[str, Any]]]]:
+    """
+    Fetch citing and cited works for many papers with OR-filter queries
+    
+    Papers are grouped into batches of CITATION_BATCH_SIZE and each batch costs one
+    paginated cited_by: and one cites: query instead of two per paper. Results are
+    assigned back to individual papers through referenced_works: a work is cited by a
+    paper when its ID is in the paper's referenced_works, and a work cites a paper when
+    the paper's ID is in the work's referenced_works. Papers with more than max_works
+    references or citations are still queried on their own so the max_works cap applies
+    as before; papers without references or citations are left out of the matching
+    queries. Completed results are cached per paper, so a rerun only queries papers
+    that are missing.
     
-    while len(all_works) < max_works:
-        params = {
-            'filter': f'cited_by:{work_id}',
-            'per_page': per_page
-        }
-        
-        # Add cursor for pagination if we have one
-        if cursor:
-            params['cursor'] = cursor
-        
-        url = f"{base_url}?{urlencode(params)}"
-        
-        for attempt in range(max_retries):
-            try:
-                response = requests.get(url, timeout=30)
-                response.raise_for_status()
-                data = response.json()
-                break
-            except requests.exceptions.RequestException as e:
-                print(f"        Error fetching citing works (attempt {attempt + 1}): {e}")
-                if attempt == max_retries - 1:
-                    return all_works
-                time.sleep(1)
-        
-        works = data.get('results', [])
-        if not works:
-            break
-        
-        # Limit to max_works
-        remaining = max_works - len(all_works)
-        works_to_add = works[:remaining]
-        all_works.extend(works_to_add)
-        
-        meta = data.get('meta', {})
-        total_count = meta.get('count', 0)
-        next_cursor = meta.get('next_cursor')
-        
-        if total_count > 0:
-            print(f"        Citing works: got {len(works_to_add)} works ({len(all_works)}/{min(max_works, total_count)} total)")
+    Args:
+        papers: List of paper dictionaries from OpenAlex API
+        max_retries: Maximum number of retry attempts per page
+        max_works: Maximum number of works kept per paper and direction
         
-        # If no next cursor or we've reached max_works, stop
-        if not next_cursor or len(all_works) >= max_works:
-            break
-            
-        cursor = next_cursor
-        time.sleep(0.5)  # Rate limiting
-    
-    return all_works
+    Returns:
+        Tuple (citing_works, cited_works) of dicts keyed by paper ID, matching
+        fetch_citing_works and fetch_cited_works for each paper
+    """
+    papers = [paper for paper in papers if 'id' in paper]
+    citing_works = {}
+    cited_works = {}
+    
+    # Reuse citations cached by earlier runs; only the remaining papers are queried
+    for paper in papers:
+        cached = cache_get('cited_by', paper['id'])
+        if cached is not None:
+            citing_works[paper['id']] = cached
+        cached = cache_get('cites', paper['id'])
+        if cached is not None:
+            cited_works[paper['id']] = cached
+    
+    def fetch_referenced_batch(batch):
+        # Works cited by any paper of the batch, assigned via each paper's referenced_works
+        batch_filter = '|'.join(bare_id(paper['id']) for paper in batch)
+        referencing_papers = {}
+        for paper in batch:
+            for ref in paper['referenced_works']:
+                referencing_papers.setdefault(ref, []).append(paper['id'])
+        result = {paper['id']: [] for paper in batch}
+        failed_pages = []
+        for work in fetch_all_works(f'cited_by:{batch_filter}', 'Citing works', max_retries,
+                                    select=REFERENCE_FIELDS, failed_pages=failed_pages):
+            for paper_id in referencing_papers.get(work.get('id'), ()):
+                result[paper_id].append(work)
+        return citing_works, 'cited_by', result, not failed_pages
+    
+    def fetch_citing_batch(batch):
+        # Works citing any paper of the batch, assigned via each work's referenced_works
+        batch_filter = '|'.join(bare_id(paper['id']) for paper in batch)
+        result = {paper['id']: [] for paper in batch}
+        failed_pages = []
+        for work in fetch_all_works(f'cites:{batch_filter}', 'Cited works', max_retries, failed_pages=failed_pages):
+            for ref in work.get('referenced_works') or []:
+                if ref in result and len(result[ref]) < max_works:
+                    result[ref].append(work)
+        return cited_works, 'cites', result, not failed_pages
+    
+    def fetch_single(target, kind, fetch, paper_id):
+        failed_pages = []
+        works = fetch(paper_id, max_retries, max_works, failed_pages)
+        return target, kind, {paper_id: works}, not failed_pages
+    
+    tasks = []
+    referencing = []
+    cited = []
+    for paper in papers:
+        if paper['id'] not in citing_works:
+            reference_count = len(paper.get('referenced_works') or [])
+            if reference_count > max_works:
+                tasks.append((fetch_single, citing_works, 'cited_by', fetch_citing_works, paper['id']))
+            elif reference_count:
+                referencing.append(paper)
+            else:
+                citing_works[paper['id']] = []
+        
+        if paper['id'] not in cited_works:
+            # cited_by_count from the paper payload tells whether the cap could be hit, and
+            # papers nobody cites need no cites: query at all
+            cited_by_count = paper.get('cited_by_count')
+            if cited_by_count is None or cited_by_count > max_works:
+                tasks.append((fetch_single, cited_works, 'cites', fetch_cited_works, paper['id']))
+            elif cited_by_count:
+                cited.append(paper)
+            else:
+                cited_works[paper['id']] = []
+    
+    for start in range(0, len(referencing), CITATION_BATCH_SIZE):
+        tasks.append((fetch_referenced_batch, referencing[start:start + CITATION_BATCH_SIZE]))
+    for start in range(0, len(cited), CITATION_BATCH_SIZE):
+        tasks.append((fetch_citing_batch, cited[start:start + CITATION_BATCH_SIZE]))
+    
+    with ThreadPoolExecutor(max_workers=CITATION_WORKERS) as executor:
+        for target, kind, result, complete in executor.map(lambda task: task[0](*task[1:]), tasks):
+            target.update(result)
+            # Only complete results are cached, so a failed page is retried on the next run
+            if complete:
+                for paper_id, works in result.items():
+                    cache_put(kind, paper_id, works)
+    
+    return citing_works, cited_works
 
 def convert_inverted_index_to_abstract(inverted_index: Dict[str, List[int]]) -> str:
     """
@@ -264,23 +462,30 @@ def convert_inverted_index_to_abstract(inverted_index: Dict[str, List[int]]) ->
     if not inverted_index:
         return ""
     
-    # Create a list to hold words in their correct positions
-    word_positions = []
-    
-    # Extract all word-position pairs
-    for word, positions in inverted_index.items():
-        for position in positions:
-            word_positions.append((position, word))
-    
-    # Sort by position
-    word_positions.sort(key=lambda x: x[0])
-    
-    # Extract just the words in order
-    words = [word for position, word in word_positions]
+    # Place each word directly at its position in a list with one slot per position:
+    # O(n), no (position, word) tuples and no sorting
+    words = [None] * sum(len(positions) for positions in inverted_index.values())
+    try:
+        for word, positions in inverted_index.items():
+            for position in positions:
+                words[position] = word
+    except IndexError:
+        # Positions beyond the word count (gaps in the index); fall back to sorting
+        return _join_words_by_sorted_position(inverted_index)
+    
+    # An empty slot means a gap or a shared position; fall back to sorting for those
+    if None in words:
+        return _join_words_by_sorted_position(inverted_index)
     
     # Join words with spaces
     return ' '.join(words)
 
+def _join_words_by_sorted_position(inverted_index: Dict[str, List[int]]) -> str:
+    """Join words ordered by a stable sort of their positions"""
+    word_positions = [(position, word) for word, positions in inverted_index.items() for position in positions]
+    word_positions.sort(key=lambda x: x[0])
+    return ' '.join(word for position, word in word_positions)
+
 def filter_paper_fields(papers: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
     """
     Filter papers to keep only the specified fields
@@ -291,60 +496,85 @@ def filter_paper_fields(papers: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
     Returns:
         List of filtered paper dictionaries with only specified fields
     """
-    filtered_papers = []
-    total_papers = len(papers)
+    return list(iter_filtered_papers(papers))
+
+def iter_filtered_papers(papers: List[Dict[str, Any]]) -> Iterator[Dict[str, Any]]:
+    """
+    Yield filtered papers one at a time
     
-    for idx, paper in enumerate(papers, 1):
-        print(f"    Processing paper {idx}/{total_papers}: {paper.get('title', 'Untitled')[:50]}...")
-        
-        filtered_paper = {}
-        
-        # Keep only the specified fields
-        if 'id' in paper:
-            filtered_paper['id'] = paper['id']
-        if 'doi' in paper:
-            filtered_paper['doi'] = paper['doi']
-        if 'title' in paper:
-            filtered_paper['title'] = paper['title']
-        if 'publication_date' in paper:
-            filtered_paper['publication_date'] = paper['publication_date']
-        if 'open_access' in paper:
-            filtered_paper['open_access'] = paper['open_access']
-        if 'primary_topic' in paper:
-            filtered_paper['primary_topic'] = paper['primary_topic']
-        if 'abstract_inverted_index' in paper:
-            filtered_paper['abstract'] = convert_inverted_index_to_abstract(paper['abstract_inverted_index'])
-        
-        # Get citation information
-        if 'id' in paper:
-            work_id = paper['id']
-            print(f"      [{idx}/{total_papers}] Fetching citations for: {work_id}")
-            
-            # Get works that cite this paper (cited_by) - limited to 1000 to avoid excessive API calls
-            print(f"      [{idx}/{total_papers}] Getting citing works...")
-            citing_works = fetch_citing_works(work_id, max_works=1000)
-            filtered_paper['cited_by_works'] = filter_citation_fields(citing_works)
-            print(f"      [{idx}/{total_papers}] Found {len(citing_works)} citing works")
-            
-            # Get works cited by this paper (cites) - limited to 1000 to avoid excessive API calls
-            print(f"      [{idx}/{total_papers}] Getting cited works...")
-            cited_works = fetch_cited_works(work_id, max_works=1000)
-            filtered_paper['cited_works'] = filter_citation_fields(cited_works)
-            print(f"      [{idx}/{total_papers}] Found {len(cited_works)} cited works")
-            
-            filtered_paper['cited_by_count'] = len(citing_works)
-            filtered_paper['cited_count'] = len(cited_works)
+    Citations are fetched for CITATION_BATCH_SIZE papers at a time, with up to
+    CITATION_PREFETCH_BATCHES batches fetched ahead of the papers being consumed, so only
+    a few batches of citation results are held in memory.
+    
+    Args:
+        papers: List of paper dictionaries from OpenAlex API
+        
+    Yields:
+        Filtered paper dictionaries with only specified fields, in input order
+    """
+    total_papers = len(papers)
+    batches = [(start, papers[start:start + CITATION_BATCH_SIZE])
+               for start in range(0, total_papers, CITATION_BATCH_SIZE)]
+    
+    with ThreadPoolExecutor(max_workers=CITATION_PREFETCH_BATCHES) as executor:
+        pending = deque()
+        next_batch = 0
+        for start, batch in batches:
+            # Keep the following batches' citation queries running while this batch is consumed
+            while next_batch < len(batches) and len(pending) < CITATION_PREFETCH_BATCHES:
+                batch_start, prefetch = batches[next_batch]
+                logger.debug("    Fetching citations for papers %d-%d/%d...", batch_start + 1, batch_start + len(prefetch), total_papers)
+                pending.append(executor.submit(fetch_citations_batched, prefetch, max_works=1000))
+                next_batch += 1
             
-            print(f"      [{idx}/{total_papers}] Citation processing complete (cited_by: {len(citing_works)}, cites: {len(cited_works)})")
+            all_citing_works, all_cited_works = pending.popleft().result()
+            for idx, paper in enumerate(batch, start + 1):
+                yield filter_paper(paper, idx, total_papers, all_citing_works, all_cited_works)
+
+def filter_paper(paper: Dict[str, Any], idx: int, total_papers: int,
+                 all_citing_works: Dict[str, List[Dict[str, Any]]],
+                 all_cited_works: Dict[str, List[Dict[str, Any]]]) -> Dict[str, Any]:
+    """
+    Filter one paper and attach its already fetched citations
+    
+    Args:
+        paper: Paper dictionary from OpenAlex API
+        idx: Position of the paper (for progress output)
+        total_papers: Number of papers being processed
+        all_citing_works: Citing works by paper ID, from fetch_citations_batched
+        all_cited_works: Cited works by paper ID, from fetch_citations_batched
+        
+    Returns:
+        Filtered paper dictionary
+    """
+    logger.debug("    Processing paper %d/%d: %s...", idx, total_papers, (paper.get('title') or 'Untitled')[:50])
+    
+    # Keep only the specified fields
+    filtered_paper = {key: paper[key] for key in KEPT_WORK_FIELDS if key in paper}
+    if 'abstract_inverted_index' in paper:
+        filtered_paper['abstract'] = convert_inverted_index_to_abstract(paper['abstract_inverted_index'])
+    
+    # Attach citation information fetched above
+    if 'id' in paper:
+        citing_works = all_citing_works[paper['id']]
+        cited_works = all_cited_works[paper['id']]
+        filtered_paper['cited_by_works'] = filter_citation_fields(citing_works)
+        filtered_paper['cited_works'] = filter_citation_fields(cited_works)
+        
+        filtered_paper['cited_by_count'] = len(citing_works)
+        filtered_paper['cited_count'] = len(cited_works)
         
-        filtered_papers.append(filtered_paper)
+        logger.debug("      [%d/%d] Citation processing complete (cited_by: %d, cites: %d)", idx, total_papers, len(citing_works), len(cited_works))
     
-    return filtered_papers
+    return filtered_paper
 
 def filter_citation_fields(works: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
     """
     Filter citation works to keep only specified fields
     
+    A work that was already filtered for another paper or topic is taken from the
+    shared record cache instead of being rebuilt and its abstract converted again.
+    
     Args:
         works: List of work dictionaries from OpenAlex API
         
@@ -354,30 +584,39 @@ def filter_citation_fields(works: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
     filtered_works = []
     
     for work in works:
-        filtered_work = {}
-        
-        if 'id' in work:
-            filtered_work['id'] = work['id']
-        if 'doi' in work:
-            filtered_work['doi'] = work['doi']
-        if 'title' in work:
-            filtered_work['title'] = work['title']
-        if 'publication_date' in work:
-            filtered_work['publication_date'] = work['publication_date']
-        if 'open_access' in work:
-            filtered_work['open_access'] = work['open_access']
-        if 'primary_topic' in work:
-            filtered_work['primary_topic'] = work['primary_topic']
+        work_id = work.get('id')
+        if work_id is not None:
+            with _filtered_works_lock:
+                filtered_work = _filtered_works.get(work_id)
+                if filtered_work is not None:
+                    _filtered_works.move_to_end(work_id)
+            if filtered_work is not None:
+                filtered_works.append(filtered_work)
+                continue
+        
+        filtered_work = {key: work[key] for key in KEPT_WORK_FIELDS if key in work}
         if 'abstract_inverted_index' in work:
             filtered_work['abstract'] = convert_inverted_index_to_abstract(work['abstract_inverted_index'])
         
+        if work_id is not None:
+            with _filtered_works_lock:
+                _filtered_works[work_id] = filtered_work
+                if len(_filtered_works) > FILTERED_WORK_CACHE_SIZE:
+                    _filtered_works.popitem(last=False)
+        
         filtered_works.append(filtered_work)
     
     return filtered_works
 
+def encode_json(obj: Any) -> bytes:
+    """Serialize obj as compact UTF-8 JSON, using orjson when available"""
+    if ORJSON_AVAILABLE:
+        return orjson.dumps(obj)
+    return json.dumps(obj, ensure_ascii=False, separators=(',', ':')).encode('utf-8')
+
 def save_topic_papers(topic_name: str, topic_id: str, papers: List[Dict[str, Any]]):
     """
-    Save topic papers to a JSON file in the domain-level directory
+    Save topic papers to a gzipped JSON file in the domain-level directory
     
     Args:
         topic_name: Name of the topic
@@ -389,40 +628,84 @@ def save_topic_papers(topic_name: str, topic_id: str, papers: List[Dict[str, Any
     os.makedirs(output_dir, exist_ok=True)
     
     # Extract topic ID from URL if needed
-    if topic_id.startswith('https://openalex.org/'):
-        topic_id = topic_id.split('/')[-1]
+    topic_id = bare_id(topic_id)
     
     # Create filename with topic name and ID
     # Replace special characters that might cause issues in filenames
     safe_name = topic_name.replace('/', '_').replace('\\', '_').replace(':', '_').replace(' ', '_')
-    filename = f"{safe_name}_{topic_id}_papers.json"
+    filename = f"{safe_name}_{topic_id}_papers.json.gz"
     filepath = os.path.join(output_dir, filename)
     
-    # Filter papers to keep only specified fields
-    filtered_papers = filter_paper_fields(papers)
-    
-    # Prepare data structure
-    output_data = {
-        "topic_info": {
-            "name": topic_name,
-            "topic_id": topic_id,
-            "total_papers": len(papers),
-            "fetch_date": time.strftime("%Y-%m-%d %H:%M:%S")
-        },
-        "papers": filtered_papers
+    topic_info = {
+        "name": topic_name,
+        "topic_id": topic_id,
+        "total_papers": len(papers),
+        "fetch_date": time.strftime("%Y-%m-%d %H:%M:%S")
     }
     
-    # Save to file
-    with open(filepath, 'w', encoding='utf-8') as f:
-        json.dump(output_data, f, indent=2, ensure_ascii=False)
+    # Stream papers to disk as they are filtered instead of building the whole document
+    # in memory. Output is compact JSON compressed at gzip level 1, which keeps the
+    # full citation graphs small without making compression the bottleneck.
+    # Write to a temporary file first so an interrupted run never leaves truncated JSON.
+    tmp_path = filepath + '.tmp'
+    saved_count = 0
+    with gzip.open(tmp_path, 'wb', compresslevel=1) as f:
+        f.write(b'{"topic_info":')
+        f.write(encode_json(topic_info))
+        f.write(b',"papers":[')
+        for filtered_paper in iter_filtered_papers(papers):
+            if saved_count:
+                f.write(b',')
+            f.write(encode_json(filtered_paper))
+            saved_count += 1
+        f.write(b']}')
+    os.replace(tmp_path, filepath)
+    
+    logger.info("    Saved %d papers to %s (filtered to %d papers with full details)", len(papers), filepath, saved_count)
+
+def process_topic(topic_name: str, topic_id: str, index: int, total: int) -> int:
+    """
+    Fetch and save papers for one topic
     
-    print(f"    Saved {len(papers)} papers to {filepath} (filtered to {len(filtered_papers)} papers with full details)")
+    Args:
+        topic_name: Name of the topic
+        topic_id: OpenAlex topic ID
+        index: Position of this topic in the overall run (for progress output)
+        total: Total number of topics in the run
+        
+    Returns:
+        Number of papers saved (0 if the topic has no papers)
+    """
+    logger.info("\n[%d/%d] Processing topic: %s (%s)...", index, total, topic_name, topic_id)
+    
+    # Fetch papers for this topic (limited to 200 papers)
+    logger.debug("    Step 1/2: Fetching papers for topic %s...", topic_name)
+    papers = fetch_papers_for_topic(topic_id, max_papers=200)
+    logger.info("    Found %d papers for %s", len(papers), topic_name)
+    
+    if not papers:
+        logger.info("    No papers found for %s, skipping...", topic_name)
+        return 0
+    
+    # Save papers to file
+    logger.debug("    Step 2/2: Processing citations and saving data...")
+    save_topic_papers(topic_name, topic_id, papers)
+    
+    return len(papers)
 
 def main():
     """
     Main function to process all topics
     """
-    print("Starting to fetch papers for all topics...")
+    parser = argparse.ArgumentParser(description='Fetch papers and their citations for every topic in data/computer_science_entities.json')
+    parser.add_argument('--verbose', action='store_true', help='Log per-page and per-paper progress')
+    args = parser.parse_args()
+    
+    # Only this script's logger goes to DEBUG, so --verbose does not also turn on urllib3's connection logs
+    logging.basicConfig(level=logging.INFO, format='%(message)s')
+    logger.setLevel(logging.DEBUG if args.verbose else logging.INFO)
+    
+    logger.info("Starting to fetch papers for all topics...")
     
     # Load topics from computer_science_entities.json
     topics = load_topics()
@@ -430,41 +713,32 @@ def main():
     total_topics = len(topics)
     processed_count = 0
     
-    print(f"Found {total_topics} topics to process...")
+    logger.info("Found %d topics to process...", total_topics)
     
-    # Process each topic
-    for topic in topics:
-        processed_count += 1
-        topic_name = topic.get('name', 'Unknown')
-        topic_id = topic.get('id', '')
+    # Topics are fetched concurrently; the shared rate limiter keeps the
+    # overall request rate within the OpenAlex polite-pool limit
+    with ThreadPoolExecutor(max_workers=TOPIC_WORKERS) as executor:
+        future_to_topic = {}
         
-        print(f"\n[{processed_count}/{total_topics}] Processing topic: {topic_name} ({topic_id})...")
+        # Process each topic
+        for topic in topics:
+            processed_count += 1
+            topic_name = topic.get('name', 'Unknown')
+            topic_id = topic.get('id', '')
+            future = executor.submit(process_topic, topic_name, topic_id, processed_count, total_topics)
+            future_to_topic[future] = topic_name
         
-        try:
-            # Fetch papers for this topic (limited to 200 papers)
-            print(f"    Step 1/2: Fetching papers for topic {topic_name}...")
-            papers = fetch_papers_for_topic(topic_id, max_papers=200)
-            print(f"    Found {len(papers)} papers for {topic_name}")
-            
-            if not papers:
-                print(f"    No papers found for {topic_name}, skipping...")
-                continue
-            
-            # Save papers to file
-            print(f"    Step 2/2: Processing citations and saving data...")
-            save_topic_papers(topic_name, topic_id, papers)
-            
-            print(f"    ✓ Successfully processed {topic_name}: {len(papers)} papers")
-            
-        except Exception as e:
-            print(f"    ✗ Error processing {topic_name}: {e}")
-            continue
-        
-        # Rate limiting between topics
-        time.sleep(2)
-    
-    print(f"\nCompleted! Processed {processed_count} topics.")
-    print("Check the 'data/domain-level' directory for results.")
+        for future in as_completed(future_to_topic):
+            topic_name = future_to_topic[future]
+            try:
+                paper_count = future.result()
+                if paper_count:
+                    logger.info("    ✓ Successfully processed %s: %d papers", topic_name, paper_count)
+            except Exception as e:
+                logger.error("    ✗ Error processing %s: %s", topic_name, e)
+    
+    logger.info("\nCompleted! Processed %d topics.", processed_count)
+    logger.info("Check the 'data/domain-level' directory for results.")
 
 if __name__ == "__main__":
-    main()
+    main()
\ No newline at end of file
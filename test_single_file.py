@@ -1,11 +1,14 @@
 #!/usr/bin/env python3
+import gzip
 import json
 import traceback
 
 def test_single_file(file_path):
     """测试单个文件的处理"""
     try:
-        with open(file_path, 'r', encoding='utf-8') as f:
+        # 话题论文文件以 gzip 压缩保存（*.json.gz）
+        opener = gzip.open if file_path.endswith('.gz') else open
+        with opener(file_path, 'rt', encoding='utf-8') as f:
             data = json.load(f)
         
         prof_info = data.get('professor_info', {})